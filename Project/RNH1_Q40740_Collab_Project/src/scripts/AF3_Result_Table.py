@@ -1,8 +1,13 @@
 import os
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import csv
 import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # Define the metrics/fields to extract from each JSON file
 CSV_HEADERS = [
@@ -13,6 +18,12 @@ CSV_HEADERS = [
     "chain_pair_pae_min_00", "chain_pair_pae_min_01", "chain_pair_pae_min_10", "chain_pair_pae_min_11"
 ]
 
+def load_json_bytes(raw):
+    # orjson parses bytes directly in C; fall back to the stdlib when it is not installed
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 def parse_job_name(json_path):
     # Extract job name from the filename, e.g., fold_rnah1_dss1_summary_confidences_0.json -> fold_rnah1_dss1
     job_name = Path(json_path).stem.replace('_summary_confidences_0', '')
@@ -20,28 +31,37 @@ def parse_job_name(json_path):
     job_name = job_name.replace('|', '-')
     return job_name
 
+def flatten_2x2(matrix):
+    # Unrolled flattening of a (possibly ragged or missing) 2x2 matrix into 4 values
+    matrix = matrix or []
+    r0 = matrix[0] if len(matrix) > 0 else ()
+    r1 = matrix[1] if len(matrix) > 1 else ()
+    return (
+        r0[0] if len(r0) > 0 else "", r0[1] if len(r0) > 1 else "",
+        r1[0] if len(r1) > 0 else "", r1[1] if len(r1) > 1 else "",
+    )
+
 def extract_metrics(json_file):
     try:
-        with open(json_file, 'r') as f:
-            content = json.load(f)
-        row = {
-            "job_name": parse_job_name(json_file),
-            "iptm": content.get("iptm", ""),
-            "ptm": content.get("ptm", ""),
-            "ranking_score": content.get("ranking_score", ""),
-            "fraction_disordered": content.get("fraction_disordered", ""),
-            "has_clash": content.get("has_clash", ""),
-            "num_recycles": content.get("num_recycles", "")
-        }
-        # Flatten chain_iptm and chain_ptm
-        row["chain_iptm_0"], row["chain_iptm_1"] = (content.get("chain_iptm", ["", ""]) + ["", ""])[:2]
-        row["chain_ptm_0"], row["chain_ptm_1"] = (content.get("chain_ptm", ["", ""]) + ["", ""])[:2]
-        # Flatten 2x2 matrices
-        for matrix_key, prefix in [("chain_pair_iptm", "chain_pair_iptm"), ("chain_pair_pae_min", "chain_pair_pae_min")]:
-            matrix = content.get(matrix_key, [["", ""], ["", ""]])
-            for i in range(2):
-                for j in range(2):
-                    row[f"{prefix}_{i}{j}"] = matrix[i][j] if matrix and len(matrix) > i and len(matrix[i]) > j else ""
+        with open(json_file, 'rb') as f:
+            content = load_json_bytes(f.read())
+        chain_iptm = (content.get("chain_iptm") or []) + ["", ""]
+        chain_ptm = (content.get("chain_ptm") or []) + ["", ""]
+        row = (
+            parse_job_name(json_file),
+            content.get("iptm", ""),
+            content.get("ptm", ""),
+            content.get("ranking_score", ""),
+            content.get("fraction_disordered", ""),
+            content.get("has_clash", ""),
+            content.get("num_recycles", ""),
+            # Flatten chain_iptm and chain_ptm
+            chain_iptm[0], chain_iptm[1],
+            chain_ptm[0], chain_ptm[1],
+        )
+        # Flatten 2x2 matrices, positionally in CSV_HEADERS order
+        row += flatten_2x2(content.get("chain_pair_iptm"))
+        row += flatten_2x2(content.get("chain_pair_pae_min"))
         return row
     except Exception as e:
         print(f"Error processing {json_file}: {e}")
@@ -54,19 +74,22 @@ def main():
     args = parser.parse_args()
 
     root = Path(args.root)
-    all_jsons = list(root.rglob('*_summary_confidences_0.json'))
-    print(f"Found {len(all_jsons)} summary_confidences_0.json files.")
+    # Stream the directory walk straight into the workers so parsing overlaps traversal
+    all_jsons = root.rglob('*_summary_confidences_0.json')
 
     rows = []
-    for json_file in all_jsons:
-        metrics = extract_metrics(json_file)
-        if metrics:
-            rows.append(metrics)
+    found = 0
+    with ProcessPoolExecutor() as executor:
+        for metrics in executor.map(extract_metrics, all_jsons, chunksize=32):
+            found += 1
+            if metrics:
+                rows.append(metrics)
+    print(f"Found {found} summary_confidences_0.json files.")
 
     # Write to CSV
     with open(args.output, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS)
         writer.writerows(rows)
     print(f"✅ Saved {len(rows)} entries to {args.output}")
 
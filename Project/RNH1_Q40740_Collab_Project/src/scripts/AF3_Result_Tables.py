@@ -1,15 +1,77 @@
 import os
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import csv
 import re
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Compiled once; matched against every fold directory and summary file name
+FOLD_DIR_RE = re.compile(r"folds_(\d+)_(\d+)")
+SUMMARY_FILE_RE = re.compile(r"fold_test_fold_job_(\d+)_q\w+_([a-zA-Z]\w+)_summary_confidences_0\.json")
+
+def load_json_bytes(raw):
+    # orjson parses bytes directly in C; fall back to the stdlib when it is not installed
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def flatten_2x2(matrix):
+    # Unrolled flattening of a (possibly ragged or missing) 2x2 matrix into 4 values
+    matrix = matrix or []
+    r0 = matrix[0] if len(matrix) > 0 else ()
+    r1 = matrix[1] if len(matrix) > 1 else ()
+    return (
+        r0[0] if len(r0) > 0 else "", r0[1] if len(r0) > 1 else "",
+        r1[0] if len(r1) > 0 else "", r1[1] if len(r1) > 1 else "",
+    )
+
+def parse_summary_file(task):
+    # Module-level so it can be pickled into ProcessPoolExecutor workers
+    summary_file, fold_group, job_number, target_protein = task
+    try:
+        with open(summary_file, 'rb') as f:
+            content = load_json_bytes(f.read())
+
+        row = [
+            fold_group,
+            job_number,
+            target_protein,
+            content.get("iptm", ""),
+            content.get("ptm", ""),
+            content.get("ranking_score", ""),
+            content.get("fraction_disordered", ""),
+            content.get("has_clash", ""),
+            content.get("num_recycles", "")
+        ]
+
+        # Flatten chain_iptm and chain_ptm
+        row += content.get("chain_iptm", ["", ""])
+        row += content.get("chain_ptm", ["", ""])
+
+        # Flatten 2x2 matrices
+        row += flatten_2x2(content.get("chain_pair_iptm"))
+        row += flatten_2x2(content.get("chain_pair_pae_min"))
+
+        return row
+
+    except Exception as e:
+        print(f"Error processing {summary_file}: {e}")
+        return None
+
+def parse_summary_files(tasks):
+    # Parse a chunk of summary files in one worker call, dropping failed files
+    return [row for row in map(parse_summary_file, tasks) if row is not None]
 
 class AF3ResultProcessor:
     def __init__(self, base_dir, output_csv="af3_summary_metrics.csv"):
         self.base_dir = Path(base_dir)
         self.output_csv = output_csv
-        self.data_rows = []
+        self.rows_written = 0
         self.missing_jobs = defaultdict(list)
         self.total_jobs = 0
         
@@ -26,70 +88,46 @@ class AF3ResultProcessor:
             "chain_pair_pae_min_10", "chain_pair_pae_min_11"
         ]
 
-    def process_summary_file(self, summary_file, fold_group, job_number, target_protein):
-        try:
-            with open(summary_file, 'r') as f:
-                content = json.load(f)
-
-            row = [
-                fold_group,
-                job_number,
-                target_protein,
-                content.get("iptm", ""),
-                content.get("ptm", ""),
-                content.get("ranking_score", ""),
-                content.get("fraction_disordered", ""),
-                content.get("has_clash", ""),
-                content.get("num_recycles", "")
-            ]
-
-            # Flatten chain_iptm and chain_ptm
-            row += content.get("chain_iptm", ["", ""])
-            row += content.get("chain_ptm", ["", ""])
-
-            # Flatten 2x2 matrices
-            for matrix_key in ["chain_pair_iptm", "chain_pair_pae_min"]:
-                matrix = content.get(matrix_key, [[None]*2]*2)
-                row += [matrix[i][j] if matrix and len(matrix) > i and len(matrix[i]) > j else ""
-                        for i in range(2) for j in range(2)]
-
-            self.data_rows.append(row)
-            return True
-
-        except Exception as e:
-            print(f"Error processing {summary_file}: {e}")
-            return False
-
-    def process_results(self):
-        # Process each fold directory
-        fold_dirs = sorted([d for d in self.base_dir.iterdir() if d.is_dir() and d.name.startswith("folds_")])
-        
-        for fold_dir in fold_dirs:
-            # Extract start and end indices from folder name
-            match = re.match(r"folds_(\d+)_(\d+)", fold_dir.name)
-            if not match:
-                continue
+    def write_rows(self, writer, future):
+        # Block on one chunk and append its rows to the CSV
+        rows = future.result()
+        writer.writerows(rows)
+        self.rows_written += len(rows)
+
+    def process_results(self, max_workers=None, chunk_size=64):
+        max_workers = max_workers or os.cpu_count()
+        # Chunks allowed in flight before the oldest is written out; bounds the rows
+        # held in memory while keeping every worker busy
+        max_in_flight = 4 * max_workers
+
+        # Fold job ranges are disjoint, so walking folds in start order and writing
+        # chunks first-in first-out streams the CSV out sorted by job number
+        fold_dirs = []
+        for d in self.base_dir.iterdir():
+            match = FOLD_DIR_RE.match(d.name)
+            if d.is_dir() and match:
+                fold_dirs.append((int(match.group(1)), int(match.group(2)), d))
+        fold_dirs.sort(key=lambda item: item[0])
+
+        in_flight = deque()
+        with open(self.output_csv, 'w', newline='') as f, \
+                ProcessPoolExecutor(max_workers=max_workers) as executor:
+            writer = csv.writer(f)
+            writer.writerow(self.csv_headers)
+
+            # Scan one fold at a time and hand its files to the workers right away, so
+            # parsing overlaps the scan of the remaining folds
+            for start_idx, end_idx, fold_dir in fold_dirs:
+                expected_jobs = set(range(start_idx, end_idx + 1))
+                found_jobs = set()
+                fold_tasks = []
                 
-            start_idx, end_idx = map(int, match.groups())
-            expected_jobs = set(range(start_idx, end_idx + 1))
-            found_jobs = set()
-            
-            print(f"Processing {fold_dir.name}...")
-            
-            # Process each job directory
-            for job_dir in fold_dir.iterdir():
-                if not job_dir.is_dir():
-                    continue
-                    
-                # Look for summary confidence files
-                summary_files = list(job_dir.glob("*_summary_confidences_0.json"))
-                if not summary_files:
-                    continue
-                    
-                for summary_file in summary_files:
+                print(f"Processing {fold_dir.name}...")
+                
+                # Look for summary confidence files in each job directory
+                for summary_file in fold_dir.glob("*/*_summary_confidences_0.json"):
                     # Extract job number and target protein from filename
-                    match = re.match(r"fold_test_fold_job_(\d+)_q[\d\w]+_([a-zA-Z][\d\w]+)_summary_confidences_0\.json", 
-                                   summary_file.name)
+                    match = SUMMARY_FILE_RE.match(summary_file.name)
                     if not match:
                         continue
                         
@@ -97,34 +135,37 @@ class AF3ResultProcessor:
                     target_protein = match.group(2)
                     found_jobs.add(job_number)
                     
-                    self.process_summary_file(summary_file, fold_dir.name, job_number, target_protein)
-            
-            # Track missing jobs for this fold group
-            missing = expected_jobs - found_jobs
-            if missing:
-                self.missing_jobs[fold_dir.name] = sorted(missing)
-            
-            self.total_jobs += len(expected_jobs)
+                    fold_tasks.append((summary_file, fold_dir.name, job_number, target_protein))
+                
+                fold_tasks.sort(key=lambda task: task[2])
+                for i in range(0, len(fold_tasks), chunk_size):
+                    in_flight.append(executor.submit(parse_summary_files, fold_tasks[i:i + chunk_size]))
+                    # Write the oldest chunks as soon as the window is full
+                    while len(in_flight) > max_in_flight:
+                        self.write_rows(writer, in_flight.popleft())
+                
+                # Track missing jobs for this fold group
+                missing = expected_jobs - found_jobs
+                if missing:
+                    self.missing_jobs[fold_dir.name] = sorted(missing)
+                
+                self.total_jobs += len(expected_jobs)
+
+            # Drain the chunks still in flight after the last fold
+            while in_flight:
+                self.write_rows(writer, in_flight.popleft())
 
     def save_results(self):
-        # Sort data rows by job number
-        self.data_rows.sort(key=lambda x: int(x[1]))
-        
-        # Write main results
-        with open(self.output_csv, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(self.csv_headers)
-            writer.writerows(self.data_rows)
-            
-        print(f"✅ Saved {len(self.data_rows)} entries to {self.output_csv}")
+        # Main results were already streamed to the CSV by process_results
+        print(f"✅ Saved {self.rows_written} entries to {self.output_csv}")
         
         # Write missing jobs report
         missing_report = "missing_jobs_report.txt"
         with open(missing_report, 'w') as f:
             f.write(f"Summary of Missing Jobs\n{'='*20}\n\n")
             f.write(f"Total expected jobs: {self.total_jobs}\n")
-            f.write(f"Total processed jobs: {len(self.data_rows)}\n")
-            f.write(f"Total missing jobs: {self.total_jobs - len(self.data_rows)}\n\n")
+            f.write(f"Total processed jobs: {self.rows_written}\n")
+            f.write(f"Total missing jobs: {self.total_jobs - self.rows_written}\n\n")
             
             if self.missing_jobs:
                 f.write("Missing jobs by fold group:\n\n")
@@ -1,7 +1,167 @@
 import pandas as pd
 import sys
-import requests
-from tqdm import tqdm
+import os
+import json
+import csv
+import time
+import asyncio
+from collections import Counter
+import aiohttp
+from tqdm.asyncio import tqdm_asyncio
+
+UNIPROT_SEARCH_URL = "https://rest.uniprot.org/uniprotkb/search"
+# Genes OR-ed together into a single UniProt search request
+UNIPROT_BATCH_SIZE = 50
+# Batch requests kept in flight at once
+UNIPROT_CONCURRENCY = 16
+UNIPROT_MAX_RETRIES = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Per-gene UniProt hits reused across runs until they are a week old
+UNIPROT_CACHE_FILE = "uniprot_cache.json"
+UNIPROT_CACHE_EXPIRE = 7 * 24 * 3600
+
+RESULT_FIELDS = ["gene", "description", "accession", "reviewed"]
+FAILED_FIELDS = ["gene", "description", "error"]
+
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    # Fall back to pandas' default (openpyxl) reader
+    EXCEL_ENGINE = None
+
+def load_uniprot_cache(cache_file):
+    """
+    Load cached UniProt hits keyed by "organism:gene", or an empty cache.
+    """
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable UniProt cache {cache_file}: {e}")
+        return {}
+
+def save_uniprot_cache(cache_file, cache):
+    """
+    Atomically persist the UniProt cache so an interrupted run cannot corrupt it.
+    """
+    tmp_file = f"{cache_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, cache_file)
+
+def result_gene_names(result):
+    """
+    Collect the upper-cased gene names and synonyms of a UniProt search result.
+    """
+    names = set()
+    for gene_info in result.get("genes", []):
+        if "geneName" in gene_info:
+            names.add(gene_info["geneName"].get("value", "").upper())
+        for synonym in gene_info.get("synonyms", []):
+            names.add(synonym.get("value", "").upper())
+    return names
+
+async def fetch_uniprot_page(session, url, params=None):
+    """
+    Fetch one page of UniProt search results, retrying transient failures.
+    
+    Returns:
+        tuple: (page JSON, URL of the next page or None)
+    """
+    for attempt in range(UNIPROT_MAX_RETRIES + 1):
+        try:
+            async with session.get(url, params=params) as res:
+                if res.status in RETRY_STATUSES and attempt < UNIPROT_MAX_RETRIES:
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+                    continue
+                res.raise_for_status()
+                data = await res.json()
+                # UniProt advertises further pages in the Link: <...>; rel="next" header
+                next_link = res.links.get("next")
+                return data, str(next_link["url"]) if next_link else None
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == UNIPROT_MAX_RETRIES:
+                raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+async def query_uniprot_batch(session, semaphore, genes, organism):
+    """
+    Query UniProt for several genes at once and group the hits by input gene.
+    
+    Args:
+        session (aiohttp.ClientSession): Session used for the request
+        semaphore (asyncio.Semaphore): Bounds the number of in-flight requests
+        genes (list): Gene names to query in one disjunctive search
+        organism (str): NCBI taxonomy ID to restrict the search to
+    
+    Returns:
+        dict: Gene name -> list of matching UniProt results
+    """
+    # Modified query to only use gene name and organism; names are quoted so ones with
+    # hyphens, dots or spaces are not parsed as query syntax
+    query = "(" + " OR ".join(f'gene_exact:"{gene}"' for gene in genes) + f") AND organism_id:{organism}"
+    params = {
+        "query": query,
+        "fields": "accession,gene_names,protein_name,organism_name,reviewed",
+        "format": "json",
+        "size": 500
+    }
+    
+    hits = {gene: [] for gene in genes}
+    url = UNIPROT_SEARCH_URL
+    async with semaphore:
+        # The batch shares one result set, so follow the cursor until every page is read;
+        # otherwise genes late in the batch would be cut off and reported as not found
+        while url is not None:
+            data, url = await fetch_uniprot_page(session, url, params)
+            params = None  # the next-page URL already carries the query and cursor
+            for result in data.get("results", []):
+                names = result_gene_names(result)
+                for gene in hits:
+                    if str(gene).upper() in names:
+                        hits[gene].append(result)
+    return hits
+
+async def query_uniprot_batch_safe(session, semaphore, batch, organism):
+    """
+    Run one batch query, returning the error instead of raising so gather keeps going.
+    
+    A client error (4xx other than 429) on a multi-gene batch is most likely one bad
+    gene name rejecting the whole query, so the batch is retried one gene at a time
+    and only the offending genes are reported as failed.
+    
+    Returns:
+        list: (batch, hits or None, exception or None) tuples
+    """
+    try:
+        hits = await query_uniprot_batch(session, semaphore, [gene for gene, _ in batch], organism)
+        return [(batch, hits, None)]
+    except aiohttp.ClientResponseError as e:
+        if len(batch) > 1 and 400 <= e.status < 500 and e.status != 429:
+            per_gene = await asyncio.gather(
+                *[query_uniprot_batch_safe(session, semaphore, [item], organism) for item in batch]
+            )
+            return [result for results in per_gene for result in results]
+        return [(batch, None, e)]
+    except Exception as e:
+        return [(batch, None, e)]
+
+async def query_uniprot_batches(batches, organism):
+    """
+    Fan all batch queries out concurrently over a single connection pool.
+    """
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(limit=UNIPROT_CONCURRENCY)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        semaphore = asyncio.Semaphore(UNIPROT_CONCURRENCY)
+        batch_results = await tqdm_asyncio.gather(
+            *[query_uniprot_batch_safe(session, semaphore, batch, organism) for batch in batches],
+            desc="Querying UniProt"
+        )
+        return [result for results in batch_results for result in results]
 
 def analyze_gene_data(file_path):
     """
@@ -14,67 +174,112 @@ def analyze_gene_data(file_path):
     try:
         # Read the Excel file
         print(f"\nReading file: {file_path}")
-        df = pd.read_excel(file_path, header=1)
+        df = pd.read_excel(file_path, header=1, engine=EXCEL_ENGINE)
         
-        # Replace missing descriptions with "Missing"
-        df['Description'] = df['Description'].fillna("Missing")
+        # Work on plain lists; the table is small, so per-call pandas overhead dominates
+        genes = df['Protein'].tolist()
+        # Replace missing descriptions with "Missing" (NaN is the only value not equal to itself)
+        descs = ["Missing" if d is None or d != d else d for d in df['Description'].tolist()]
         
         # Basic information
         print("\n=== Basic Information ===")
-        print(f"Total genes: {len(df)}")
+        print(f"Total genes: {len(genes)}")
         print(f"Columns: {', '.join(df.columns)}")
         
         # Create gene-description pairs
-        gene_desc_pairs = list(zip(df['Protein'], df['Description']))
+        gene_desc_pairs = list(zip(genes, descs))
         print(f"\nTotal gene-description pairs: {len(gene_desc_pairs)}")
         
         # Check for missing values
         print("\n=== Missing Value Analysis ===")
-        missing_protein = df['Protein'].isna().sum()
-        missing_desc = (df['Description'] == "Missing").sum()
+        missing_protein = sum(1 for g in genes if g is None or g != g)
+        missing_desc = sum(1 for d in descs if d == "Missing")
         print(f"Missing gene names: {missing_protein}")
         print(f"Missing descriptions (replaced with 'Missing'): {missing_desc}")
         
         if missing_desc > 0:
             print("\nGenes with missing descriptions:")
-            missing_desc_df = df[df['Description'] == "Missing"]
-            print(missing_desc_df[['Protein', 'Description']].to_string())
+            for gene, desc in gene_desc_pairs:
+                if desc == "Missing":
+                    print(f"{gene}: {desc}")
         
         # Check for duplicates
         print("\n=== Duplicate Analysis ===")
-        duplicates = df[df['Protein'].duplicated(keep=False)]
+        gene_counts = Counter(genes)
+        duplicates = [(gene, desc) for gene, desc in gene_desc_pairs if gene_counts[gene] > 1]
         if len(duplicates) > 0:
             print(f"Found {len(duplicates)} duplicate genes:")
-            print(duplicates.sort_values('Protein')[['Protein', 'Description']].to_string())
+            for gene, desc in sorted(duplicates, key=lambda pair: str(pair[0])):
+                print(f"{gene}: {desc}")
         else:
             print("No duplicate genes found.")
         
         # Save the complete gene list
         print("\n=== Saving Results ===")
         # Save all genes to a CSV file
+        df['Description'] = descs
         df.to_csv('complete_gene_list.csv', index=False)
         print("Saved complete gene list to 'complete_gene_list.csv'")
         
         # Perform UniProt queries
         print("\n=== Performing UniProt Queries ===")
         organism = "9606"  # Human
-        results = []
         failed = []
         
-        for gene, description in tqdm(gene_desc_pairs, desc="Querying UniProt"):
-            # Modified query to only use gene name and organism
-            query = f'gene_exact:{gene} AND organism_id:{organism}'
-            url = "https://rest.uniprot.org/uniprotkb/search"
-            params = {
-                "query": query,
-                "fields": "accession,gene_names,protein_name,organism_name,reviewed",
-                "format": "json",
-                "size": 500
-            }
-            try:
-                res = requests.get(url, params=params, timeout=30)
-                data = res.json()
-                results_list = data.get("results", [])
+        # Serve genes already fetched on a previous run from the on-disk cache
+        cache = load_uniprot_cache(UNIPROT_CACHE_FILE)
+        gene_hits = {}
+        gene_errors = {}
+        to_query = []
+        queued = set()
+        for gene, description in gene_desc_pairs:
+            # Rows without a gene name have nothing to query and are reported as not found
+            if gene is None or gene != gene:
+                continue
+            # Duplicate genes are queried once; every row is joined back via gene_hits
+            if gene in gene_hits or gene in queued:
+                continue
+            entry = cache.get(f"{organism}:{gene}")
+            if entry is not None and time.time() - entry["fetched"] < UNIPROT_CACHE_EXPIRE:
+                gene_hits[gene] = entry["results"]
+            else:
+                to_query.append((gene, description))
+                queued.add(gene)
+        print(f"Cached genes: {len(gene_hits)}, genes to query: {len(to_query)}")
+        
+        batches = [to_query[i:i + UNIPROT_BATCH_SIZE]
+                   for i in range(0, len(to_query), UNIPROT_BATCH_SIZE)]
+        batch_results = asyncio.run(query_uniprot_batches(batches, organism))
+        
+        fetched = time.time()
+        for batch, hits, error in batch_results:
+            if error is not None:
+                for gene, _ in batch:
+                    gene_errors[gene] = str(error)
+                print(f"Error for batch starting at {batch[0][0]}: {error}")
+                continue
+            
+            for gene, results_list in hits.items():
+                gene_hits[gene] = results_list
+                cache[f"{organism}:{gene}"] = {"fetched": fetched, "results": results_list}
+        save_uniprot_cache(UNIPROT_CACHE_FILE, cache)
+        
+        # Stream each hit straight to the results CSV instead of collecting row dicts
+        successful = 0
+        with open("uniprot_results.csv", 'w', newline='') as results_file:
+            results_writer = csv.DictWriter(results_file, fieldnames=RESULT_FIELDS)
+            results_writer.writeheader()
+            
+            for gene, description in gene_desc_pairs:
+                if gene in gene_errors:
+                    failed.append({
+                        "gene": gene,
+                        "description": description,
+                        "error": gene_errors[gene]
+                    })
+                    continue
+                
+                results_list = gene_hits.get(gene, [])
                 
                 if not results_list:
                     failed.append({
@@ -84,30 +289,21 @@ def analyze_gene_data(file_path):
                 
                 # Add all results
                 for result in results_list:
-                    results.append({
+                    results_writer.writerow({
                         "gene": gene,
                         "description": description,
                         "accession": result.get("primaryAccession"),
                         "reviewed": result.get("reviewed", False)
                     })
-                    
-            except Exception as e:
-                failed.append({
-                    "gene": gene,
-                    "description": description,
-                    "error": str(e)
-                })
-                print(f"Error for {gene}: {e}")
-        
-        # Save results
-        results_df = pd.DataFrame(results)
-        results_df.to_csv("uniprot_results.csv", index=False)
+                    successful += 1
         print("\nSaved UniProt results to uniprot_results.csv")
         
         # Save failed queries
         if failed:
-            failed_df = pd.DataFrame(failed)
-            failed_df.to_csv("failed_queries.csv", index=False)
+            with open("failed_queries.csv", 'w', newline='') as failed_file:
+                failed_writer = csv.DictWriter(failed_file, fieldnames=FAILED_FIELDS)
+                failed_writer.writeheader()
+                failed_writer.writerows(failed)
             print(f"\nFailed queries ({len(failed)}):")
             for item in failed:
                 print(f"{item['gene']}: {item['description']}")
@@ -115,11 +311,11 @@ def analyze_gene_data(file_path):
         
         # Summary statistics
         print("\n=== Summary Statistics ===")
-        print(f"Total genes: {len(df)}")
-        print(f"Genes with complete information: {len(df) - missing_desc}")
+        print(f"Total genes: {len(genes)}")
+        print(f"Genes with complete information: {len(genes) - missing_desc}")
         print(f"Genes with missing descriptions: {missing_desc}")
         print(f"Duplicate genes: {len(duplicates)}")
-        print(f"Successful UniProt queries: {len(results)}")
+        print(f"Successful UniProt queries: {successful}")
         print(f"Failed UniProt queries: {len(failed)}")
         
         # Print first few entries as example
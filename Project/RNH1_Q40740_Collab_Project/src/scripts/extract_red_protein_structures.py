@@ -1,6 +1,7 @@
 import os
 import shutil
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Paths (update these if needed for your cluster)
 RED_PROTEIN_IDS_FILE = '/data7/Conny/specific_proteins/red_proteins/red_protein_ids.txt'
@@ -9,6 +10,7 @@ AFP_SOURCE_ROOT = '/data7/Conny/result_mmseqs2/pulldown_results/gpu_all'
 AF3_DEST = '/data7/Conny/specific_proteins/red_proteins/AF3'
 AFP_DEST = '/data7/Conny/specific_proteins/red_proteins/AFP'
 Q04740 = 'q04740'
+COPY_WORKERS = 16
 
 # Ensure destination directories exist
 os.makedirs(AF3_DEST, exist_ok=True)
@@ -18,41 +20,91 @@ def read_protein_ids(filepath):
     with open(filepath) as f:
         return [line.strip() for line in f if line.strip()]
 
-def find_cif_file(protein_id):
-    # Traverse all subfolders in AF3_SOURCE_ROOT
-    for root, dirs, files in os.walk(AF3_SOURCE_ROOT):
-        # Look for folder names containing both q04740 and the protein_id
-        if Q04740 in root.lower() and protein_id.lower() in root.lower():
-            for file in files:
-                if file.endswith('_model_0.cif'):
-                    return os.path.join(root, file)
+def iter_model_cifs(top):
+    # Top-down os.scandir walk yielding (folder, model_0 CIF) for q04740 folders.
+    # DirEntry carries the file type from readdir, so no extra stat per entry, and a
+    # folder that already holds its model_0 CIF is not descended into any further.
+    stack = [top]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        if Q04740 in folder.lower():
+            cif = next((entry.name for entry in entries
+                        if entry.name.endswith('_model_0.cif') and entry.is_file()), None)
+            if cif is not None:
+                yield folder, os.path.join(folder, cif)
+                continue
+        subdirs = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+        stack.extend(reversed(subdirs))
+
+def build_cif_index():
+    # Walk AF3_SOURCE_ROOT once and remember the model_0 CIF of every q04740 folder
+    index = {}
+    candidates = []
+    for folder, cif_path in iter_model_cifs(AF3_SOURCE_ROOT):
+        folder_lower = folder.lower()
+        candidates.append((folder_lower, cif_path))
+        # Folder names carry the partner protein id as one of their '_' separated parts
+        for token in os.path.basename(folder_lower).split('_'):
+            if token != Q04740:
+                index.setdefault(token, cif_path)
+    return index, candidates
+
+def find_cif_file(protein_id, cif_index):
+    index, candidates = cif_index
+    pid = protein_id.lower()
+    if pid in index:
+        return index[pid]
+    # Fall back to the old substring match, now against the in-memory folder list
+    for root_lower, cif_path in candidates:
+        if pid in root_lower:
+            return cif_path
     return None
 
-def find_pdb_file(protein_id):
+def build_pdb_folders():
+    # One directory listing instead of a stat per protein id
+    if not os.path.isdir(AFP_SOURCE_ROOT):
+        return set()
+    with os.scandir(AFP_SOURCE_ROOT) as it:
+        return {entry.name for entry in it if entry.is_dir()}
+
+def find_pdb_file(protein_id, pdb_folders):
     folder = f'Q04740_and_{protein_id}'
+    if folder not in pdb_folders:
+        return None
     pdb_path = os.path.join(AFP_SOURCE_ROOT, folder, 'ranked_0.pdb')
     return pdb_path if os.path.isfile(pdb_path) else None
 
 def main():
     protein_ids = read_protein_ids(RED_PROTEIN_IDS_FILE)
+    cif_index = build_cif_index()
+    pdb_folders = build_pdb_folders()
     log = []
+    copies = []
     for pid in protein_ids:
         # AF3 (CIF)
-        cif_src = find_cif_file(pid)
+        cif_src = find_cif_file(pid, cif_index)
         cif_dst = os.path.join(AF3_DEST, f'AF3_{pid}.cif')
         if cif_src:
-            shutil.copy2(cif_src, cif_dst)
+            copies.append((cif_src, cif_dst))
             log.append(f'Copied CIF for {pid}: {cif_src} -> {cif_dst}')
         else:
             log.append(f'MISSING CIF for {pid}')
         # AFP (PDB)
-        pdb_src = find_pdb_file(pid)
+        pdb_src = find_pdb_file(pid, pdb_folders)
         pdb_dst = os.path.join(AFP_DEST, f'AFP_{pid}.pdb')
         if pdb_src:
-            shutil.copy2(pdb_src, pdb_dst)
+            copies.append((pdb_src, pdb_dst))
             log.append(f'Copied PDB for {pid}: {pdb_src} -> {pdb_dst}')
         else:
             log.append(f'MISSING PDB for {pid}')
+    # Copies are I/O bound, so overlap them across threads
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        list(executor.map(lambda pair: shutil.copy2(*pair), copies))
     # Write log
     with open('extract_red_protein_structures.log', 'w') as f:
         for line in log:
@@ -1,32 +1,43 @@
-import pandas as pd
+import pyarrow.dataset as ds
+import xlsxwriter
 import os
+from pathlib import Path
 
-# Read the filtered AFP_Jack data
-afp_jack_data = pd.read_csv('/Users/conny/Desktop/AlphaFold/Project/RNH1_Q40740_Collab_Project/results/AFP_Jack_predictions_with_good_interpae.csv')
-afp_jack_filtered = afp_jack_data[(afp_jack_data['iptm_ptm'] >= 0.5) & (afp_jack_data['iptm'] >= 0.6)]
+# Read the filtered AFP_Jack data; only the needed columns are parsed and the
+# iptm/iptm_ptm filter is applied during the scan, before anything reaches pandas
+afp_jack_dataset = ds.dataset('/Users/conny/Desktop/AlphaFold/Project/RNH1_Q40740_Collab_Project/results/AFP_Jack_predictions_with_good_interpae.csv', format='csv')
+afp_jack_filtered = afp_jack_dataset.to_table(
+    columns=['jobs', 'iptm', 'iptm_ptm'],
+    filter=(ds.field('iptm_ptm') >= 0.5) & (ds.field('iptm') >= 0.6)
+).to_pandas()
 
 # Extract target names by removing "Q04740_and_" prefix
-target_names = afp_jack_filtered['jobs'].str.replace('Q04740_and_', '')
+target_names = afp_jack_filtered['jobs'].str.removeprefix('Q04740_and_')
 
-# Save to text file
-with open('afp_Jack_target_names.txt', 'w') as f:
-    for name in target_names:
-        f.write(f"{name}\n")
+# Save to text file in a single write
+Path('afp_Jack_target_names.txt').write_bytes(''.join(target_names + '\n').encode())
 
-# Save to Excel
-target_df = pd.DataFrame({'Target_Names': target_names})
-target_df.to_excel('afp_Jack_target_names.xlsx', index=False)
+# Save to Excel, streaming the column straight through xlsxwriter
+workbook = xlsxwriter.Workbook('afp_Jack_target_names.xlsx', {'constant_memory': True})
+worksheet = workbook.add_worksheet()
+worksheet.write_string(0, 0, 'Target_Names')
+for row_idx, name in enumerate(target_names, start=1):
+    worksheet.write_string(row_idx, 0, name)
+workbook.close()
 
 # Create a script to copy PDB files (optional - only if PDB files exist)
-with open('copy_afp_jack_pdb_files.sh', 'w') as f:
-    f.write('#!/bin/bash\n\n')
-    f.write('source_dir="/Users/conny/Desktop/AlphaFold/Project/RNH1_Q40740_Collab_Project/results/ranked_pdbs"\n')
-    f.write('dest_dir="/Users/conny/Desktop/AlphaFold/Project/RNH1_Q40740_Collab_Project/results/Best_Proteins_MMseqs2_Jack"\n\n')
-    f.write('mkdir -p "$dest_dir"\n\n')
-    
-    for name in target_names:
-        pdb_file = f"Q04740_and_{name}_ranked_0.pdb"
-        f.write(f'cp "$source_dir/{pdb_file}" "$dest_dir/" 2>/dev/null || echo "PDB file not found: {pdb_file}"\n')
+# Build every cp line as one vectorized string op, then write the script at once
+pdb_files = 'Q04740_and_' + target_names + '_ranked_0.pdb'
+copy_lines = 'cp "$source_dir/' + pdb_files + '" "$dest_dir/" 2>/dev/null || echo "PDB file not found: ' + pdb_files + '"\n'
+script_parts = [
+    '#!/bin/bash\n\n',
+    'source_dir="/Users/conny/Desktop/AlphaFold/Project/RNH1_Q40740_Collab_Project/results/ranked_pdbs"\n',
+    'dest_dir="/Users/conny/Desktop/AlphaFold/Project/RNH1_Q40740_Collab_Project/results/Best_Proteins_MMseqs2_Jack"\n\n',
+    'mkdir -p "$dest_dir"\n\n',
+    *copy_lines,
+]
+with open('copy_afp_jack_pdb_files.sh', 'wb') as f:
+    f.write(''.join(script_parts).encode())
 
 print("Scripts and files have been generated:")
 print("1. afp_Jack_target_names.txt - Contains list of target names")
@@ -10,25 +10,25 @@ def count_sequence_lengths(fasta_file):
     """
     sequence_lengths = {}
     current_id = None
-    current_sequence = ""
+    current_length = 0
     
+    # Only lengths are needed, so accumulate them instead of building sequence strings
     with open(fasta_file, 'r') as f:
         for line in f:
             line = line.strip()
             if line.startswith('>'):
                 # If we have a previous sequence, save its length
                 if current_id:
-                    sequence_lengths[current_id] = len(current_sequence)
+                    sequence_lengths[current_id] = current_length
                 # Start new sequence
                 current_id = line[1:]  # Remove the '>' character
-                current_sequence = ""
+                current_length = 0
             else:
-                # Add to current sequence
-                current_sequence += line
+                current_length += len(line)
     
     # Don't forget to add the last sequence
     if current_id:
-        sequence_lengths[current_id] = len(current_sequence)
+        sequence_lengths[current_id] = current_length
     
     return sequence_lengths
 
@@ -1,18 +1,25 @@
 import pandas as pd
+from pathlib import Path
+
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    # Fall back to pandas' default (openpyxl) reader
+    EXCEL_ENGINE = None
 
 def extract_overlapping_proteins():
     # Read the Excel file
     excel_path = "/Users/conny/Desktop/AlphaFold/Summer Project/src/26 Overlapped Analysis/protein_overlaps.xlsx"
-    df = pd.read_excel(excel_path, sheet_name='All Three Papers')
+    # calamine parses xlsx natively when installed; only the two columns written below are loaded
+    df = pd.read_excel(excel_path, sheet_name='All Three Papers', engine=EXCEL_ENGINE,
+                       usecols=['Protein Accession', 'Amino Acid Sequence'])
     
     # Write overlapping proteins to FASTA file
     output_file = "overlapping_proteins.fasta"
-    with open(output_file, 'w') as f:
-        for _, row in df.iterrows():
-            accession = row['Protein Accession']
-            sequence = row['Amino Acid Sequence']
-            f.write(f">{accession}\n")
-            f.write(f"{sequence}\n")
+    # Build every record as one vectorized string op and write the file in a single call
+    records = '>' + df['Protein Accession'].astype(str) + '\n' + df['Amino Acid Sequence'].astype(str) + '\n'
+    Path(output_file).write_bytes(records.str.cat(sep='').encode())
     
     print(f"\nAnalysis complete!")
     print(f"Number of overlapping proteins: {len(df)}")
@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 
 FASTA_PATH = "overlapping_proteins.fasta"
 OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -12,21 +12,20 @@ DNA4 = "GTCATTTGAATTCATGGCTTAGAGCTTAATTGCTGAATCTGGTGCTGGGATCCAACATGT"
 RNA1 = "GCACCAGAUUCAGCAAUUAAGCUCUAAGCC"
 RNA2 = "GGCUUAGAGCUUAAUUGCUGAAUCUGGUGC"
 
-# Read FASTA
-proteins = []
-with open(os.path.join(OUTPUT_DIR, FASTA_PATH)) as f:
+# Read an open FASTA file lazily, one (name, sequence) record at a time
+def read_fasta(f):
     name, seq = None, []
     for line in f:
         line = line.strip()
         if line.startswith('>'):
             if name:
-                proteins.append((name, ''.join(seq)))
+                yield name, ''.join(seq)
             name = line[1:]
             seq = []
         else:
             seq.append(line)
     if name:
-        proteins.append((name, ''.join(seq)))
+        yield name, ''.join(seq)
 
 # Helper to build entries
 
@@ -47,26 +46,42 @@ def make_entry(name, seqs, tag):
             entry["sequences"].append({"rnaSequence": {"sequence": s[1], "count": 1}})
     return entry
 
-# Build all four sets
-ssDNA = []
-Rloop = []
-dsDNA = []
-dsRNA = []
-
-for name, seq in proteins:
-    ssDNA.append(make_entry(name, [("proteinChain", seq), ("dnaSequence", DNA1)], "DNA1"))
-    Rloop.append(make_entry(name, [("proteinChain", seq), ("dnaSequence", DNA2), ("dnaSequence", DNA4), ("rnaSequence", RNA1)], "Rloop"))
-    dsDNA.append(make_entry(name, [("proteinChain", seq), ("dnaSequence", DNA1), ("dnaSequence", DNA3)], "dsDNA"))
-    dsRNA.append(make_entry(name, [("proteinChain", seq), ("rnaSequence", RNA1), ("rnaSequence", RNA2)], "dsRNA"))
-
-# Write JSON files
-with open(os.path.join(OUTPUT_DIR, "ssDNA_predictions.json"), "w") as f:
-    json.dump(ssDNA, f, indent=2)
-with open(os.path.join(OUTPUT_DIR, "Rloop_predictions.json"), "w") as f:
-    json.dump(Rloop, f, indent=2)
-with open(os.path.join(OUTPUT_DIR, "dsDNA_predictions.json"), "w") as f:
-    json.dump(dsDNA, f, indent=2)
-with open(os.path.join(OUTPUT_DIR, "dsRNA_predictions.json"), "w") as f:
-    json.dump(dsRNA, f, indent=2)
+# Build all four sets, streaming each entry into its JSON array as it is made
+# so no per-set list of entries is held in memory. Arrays are written to .tmp
+# files and only moved over the real outputs once every array is complete, so a
+# missing FASTA or a mid-run error never leaves truncated JSON behind.
+output_paths = {
+    key: os.path.join(OUTPUT_DIR, f"{key}_predictions.json")
+    for key in ("ssDNA", "Rloop", "dsDNA", "dsRNA")
+}
+# Open the FASTA before touching any output file
+with open(os.path.join(OUTPUT_DIR, FASTA_PATH)) as fasta:
+    output_files = {key: open(f"{path}.tmp", "wb") for key, path in output_paths.items()}
+    try:
+        for f in output_files.values():
+            f.write(b"[")
+        
+        for i, (name, seq) in enumerate(read_fasta(fasta)):
+            entries = {
+                "ssDNA": make_entry(name, [("proteinChain", seq), ("dnaSequence", DNA1)], "DNA1"),
+                "Rloop": make_entry(name, [("proteinChain", seq), ("dnaSequence", DNA2), ("dnaSequence", DNA4), ("rnaSequence", RNA1)], "Rloop"),
+                "dsDNA": make_entry(name, [("proteinChain", seq), ("dnaSequence", DNA1), ("dnaSequence", DNA3)], "dsDNA"),
+                "dsRNA": make_entry(name, [("proteinChain", seq), ("rnaSequence", RNA1), ("rnaSequence", RNA2)], "dsRNA"),
+            }
+            separator = b"\n" if i == 0 else b",\n"
+            for key, entry in entries.items():
+                output_files[key].write(separator + orjson.dumps(entry, option=orjson.OPT_INDENT_2))
+        
+        for f in output_files.values():
+            f.write(b"\n]")
+    except BaseException:
+        for f in output_files.values():
+            f.close()
+            os.remove(f.name)
+        raise
+    
+    for key, f in output_files.items():
+        f.close()
+        os.replace(f.name, output_paths[key])
 
 print("All JSON files generated!") 
\ No newline at end of file
@@ -1,9 +1,10 @@
-import json
+import orjson
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 def modify_json_file(file_path):
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    with open(file_path, 'rb') as f:
+        data = orjson.loads(f.read())
     
     # Modify the structure
     modified_data = {
@@ -34,17 +35,21 @@ def modify_json_file(file_path):
     }
     
     # Write back to file
-    with open(file_path, 'w') as f:
-        json.dump(modified_data, f, indent=2)
+    with open(file_path, 'wb') as f:
+        f.write(orjson.dumps(modified_data, option=orjson.OPT_INDENT_2))
 
-# Directory containing JSON files
-json_dir = "/Users/conny/Desktop/AlphaFold/local_json_files_no_msa"
-
-# Process all JSON files in the directory
-for filename in os.listdir(json_dir):
-    if filename.endswith('.json'):
-        file_path = os.path.join(json_dir, filename)
-        print(f"Processing {filename}...")
-        modify_json_file(file_path)
+def main():
+    # Directory containing JSON files
+    json_dir = "/Users/conny/Desktop/AlphaFold/local_json_files_no_msa"
+    
+    # Each file is an independent read-modify-write, so process them in parallel
+    file_paths = [os.path.join(json_dir, filename) for filename in os.listdir(json_dir)
+                  if filename.endswith('.json')]
+    with ProcessPoolExecutor() as executor:
+        for file_path, _ in zip(file_paths, executor.map(modify_json_file, file_paths, chunksize=32)):
+            print(f"Processed {os.path.basename(file_path)}")
+    
+    print("All files have been modified successfully!")
 
-print("All files have been modified successfully!") 
\ No newline at end of file
+if __name__ == "__main__":
+    main()
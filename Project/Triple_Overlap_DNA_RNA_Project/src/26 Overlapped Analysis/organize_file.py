@@ -12,18 +12,22 @@ json_folder = os.path.join(base_dir, "cluster_overlapped_json")
 os.makedirs(cif_folder, exist_ok=True)
 os.makedirs(json_folder, exist_ok=True)
 
+def move_file(src, dst):
+    # Same-filesystem moves are a single rename; fall back to shutil.move across devices
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+    print(f"Moved {src} -> {dst}")
+
 # Walk through the directory tree
 for root, dirs, files in os.walk(base_dir):
+    # Skip the output folders so already-organized files are not revisited
+    dirs[:] = [d for d in dirs if os.path.join(root, d) not in (cif_folder, json_folder)]
     for file in files:
         if file.endswith("_model.cif"):
-            src = os.path.join(root, file)
-            dst = os.path.join(cif_folder, file)
-            shutil.move(src, dst)
-            print(f"Moved {src} -> {dst}")
+            move_file(os.path.join(root, file), os.path.join(cif_folder, file))
         elif file.endswith("_summary_confidences.json"):
-            src = os.path.join(root, file)
-            dst = os.path.join(json_folder, file)
-            shutil.move(src, dst)
-            print(f"Moved {src} -> {dst}")
+            move_file(os.path.join(root, file), os.path.join(json_folder, file))
 
 print("Done organizing files!")
\ No newline at end of file
@@ -7,21 +7,31 @@ folder = "/Users/conny/Desktop/folds_2025_06_12_16_32/27_overlapped_cif"  # <--
 # Regex to extract accession (e.g., o00567)
 pattern = re.compile(r'_\d+_([0-9a-zA-Z]+)_')
 
-for filename in os.listdir(folder):
+# Snapshot the listing first so renamed files are not revisited mid-iteration;
+# DirEntry.is_file() uses the cached d_type instead of another stat
+with os.scandir(folder) as it:
+    entries = list(it)
+# Names already taken in the folder; checked in memory instead of stat-ing each target.
+# Casefolded so a case-insensitive filesystem (the macOS default) cannot clobber a file
+existing_names = {entry.name.casefold() for entry in entries}
+
+for entry in entries:
     # Only process files (not directories)
-    if os.path.isfile(os.path.join(folder, filename)):
-        match = pattern.search(filename)
+    if entry.is_file():
+        match = pattern.search(entry.name)
         if match:
             accession = f"o{match.group(1)}"
-            ext = os.path.splitext(filename)[1]
+            ext = os.path.splitext(entry.name)[1]
             new_name = accession + ext
-            src = os.path.join(folder, filename)
+            src = entry.path
             dst = os.path.join(folder, new_name)
             # Avoid overwriting files
-            if not os.path.exists(dst):
+            if new_name.casefold() not in existing_names:
                 os.rename(src, dst)
-                print(f"Renamed {filename} -> {new_name}")
+                existing_names.discard(entry.name.casefold())
+                existing_names.add(new_name.casefold())
+                print(f"Renamed {entry.name} -> {new_name}")
             else:
-                print(f"Skipped {filename}: {new_name} already exists")
+                print(f"Skipped {entry.name}: {new_name} already exists")
         else:
-            print(f"Skipped {filename}: no accession found")
\ No newline at end of file
+            print(f"Skipped {entry.name}: no accession found")
\ No newline at end of file
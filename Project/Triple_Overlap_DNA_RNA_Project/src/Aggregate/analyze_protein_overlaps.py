@@ -1,9 +1,69 @@
 import pandas as pd
+import matplotlib
+# Headless backend: the script only saves figures, so skip any GUI backend import
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib_venn import venn3
-from Bio import SeqIO
+from Bio.SeqIO.FastaIO import SimpleFastaParser
 from collections import defaultdict
 import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import xlsxwriter
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Block size for raw FASTA copies
+FASTA_COPY_BLOCK = 1 << 22
+
+# Venn region for each (in p1, in p2, in p3) membership pattern
+REGION_BY_MEMBERSHIP = {
+    (True, False, False): "p1_only",
+    (False, True, False): "p2_only",
+    (False, False, True): "p3_only",
+    (True, True, False): "p1_p2",
+    (True, False, True): "p1_p3",
+    (False, True, True): "p2_p3",
+    (True, True, True): "all_three",
+}
+
+def compute_overlap_regions(protein_sets):
+    """Compute every Venn region of the three protein sets once, as sorted lists"""
+    p1, p2, p3 = (frozenset(s) for s in protein_sets)
+    regions = {region: [] for region in REGION_BY_MEMBERSHIP.values()}
+    appenders = {membership: regions[region].append for membership, region in REGION_BY_MEMBERSHIP.items()}
+    # Sort the union once; partitioning it in order leaves every region already sorted
+    for protein in sorted(p1 | p2 | p3):
+        appenders[(protein in p1, protein in p2, protein in p3)](protein)
+    return regions
+
+def load_fasta_table(fasta_file):
+    """
+    Return (accessions, sequences) for a FASTA file, via a Parquet cache.
+    
+    The first parse writes <fasta_file>.parquet next to the FASTA; later runs read
+    that columnar copy instead of re-tokenizing the FASTA, as long as it is not
+    older than the FASTA itself.
+    """
+    cache_file = f"{fasta_file}.parquet"
+    fasta_mtime = os.path.getmtime(fasta_file)
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= fasta_mtime:
+        table = pq.read_table(cache_file, columns=['accession', 'sequence'])
+        return table.column('accession').to_pylist(), table.column('sequence').to_pylist()
+    
+    accessions = []
+    sequences = []
+    with open(fasta_file, 'r') as handle:
+        # SimpleFastaParser yields plain (title, sequence) strings, no SeqRecord objects
+        for title, sequence in SimpleFastaParser(handle):
+            accessions.append(title.split(None, 1)[0] if title else "")
+            sequences.append(sequence)
+    
+    try:
+        pq.write_table(pa.table({'accession': accessions, 'sequence': sequences}), cache_file)
+    except OSError as e:
+        print(f"Warning: could not write FASTA cache {cache_file}: {e}")
+    return accessions, sequences
 
 def read_fasta_and_csv_proteins(fasta_file, csv_file):
     """Read protein IDs and descriptions from FASTA and CSV files"""
@@ -13,26 +73,24 @@ def read_fasta_and_csv_proteins(fasta_file, csv_file):
     
     # Read CSV file to get descriptions and gene information
     try:
-        if "paper3" in csv_file:
-            df = pd.read_csv(csv_file, encoding='latin1')
-            for _, row in df.iterrows():
-                protein_info[row['accession']] = row['protein_name']
-                protein_genes[row['accession']] = row.get('gene', 'No gene information available')
+        desc_col = 'protein_name' if "paper3" in csv_file else 'description'
+        # Only parse the three columns used here, as strings, skipping type inference
+        wanted = {'accession', desc_col, 'gene'}
+        df = pd.read_csv(csv_file, encoding='latin1', usecols=lambda c: c in wanted, dtype=str)
+        protein_info = dict(zip(df['accession'], df[desc_col]))
+        if 'gene' in df.columns:
+            protein_genes = dict(zip(df['accession'], df['gene']))
         else:
-            df = pd.read_csv(csv_file, encoding='latin1')
-            for _, row in df.iterrows():
-                protein_info[row['accession']] = row['description']
-                protein_genes[row['accession']] = row.get('gene', 'No gene information available')
+            protein_genes = dict.fromkeys(df['accession'], 'No gene information available')
     except FileNotFoundError:
         print(f"Warning: CSV file {csv_file} not found")
     
     # Read FASTA file to get protein IDs and sequences
     protein_ids = set()
     try:
-        with open(fasta_file, 'r') as handle:
-            for record in SeqIO.parse(handle, "fasta"):
-                protein_ids.add(record.id)
-                protein_sequences[record.id] = str(record.seq)
+        accessions, sequences = load_fasta_table(fasta_file)
+        protein_ids = set(accessions)
+        protein_sequences = dict(zip(accessions, sequences))
     except FileNotFoundError:
         print(f"Warning: FASTA file {fasta_file} not found")
     
@@ -40,148 +98,179 @@ def read_fasta_and_csv_proteins(fasta_file, csv_file):
 
 def merge_fasta_files(fasta_files, output_file="master_proteins.fasta"):
     """Merge multiple FASTA files into one master file"""
-    all_records = []
-    for fasta_file in fasta_files:
-        try:
-            with open(fasta_file, 'r') as handle:
-                records = list(SeqIO.parse(handle, "fasta"))
-                all_records.extend(records)
-        except FileNotFoundError:
-            print(f"Warning: File {fasta_file} not found")
-    
-    # Write all records to master file
-    with open(output_file, 'w') as output_handle:
-        SeqIO.write(all_records, output_handle, "fasta")
+    record_count = 0
+    # FASTA concatenation preserves the format, so copy raw bytes in 4 MiB blocks
+    # and only count record headers ('>' at the start of a line) on the way through
+    with open(output_file, 'wb') as output_handle:
+        for fasta_file in fasta_files:
+            try:
+                with open(fasta_file, 'rb') as handle:
+                    previous = b'\n'
+                    while True:
+                        block = handle.read(FASTA_COPY_BLOCK)
+                        if not block:
+                            break
+                        output_handle.write(block)
+                        record_count += block.count(b'\n>') + (previous == b'\n' and block[:1] == b'>')
+                        previous = block[-1:]
+                    # Keep the next file's first header on its own line
+                    if previous != b'\n':
+                        output_handle.write(b'\n')
+            except FileNotFoundError:
+                print(f"Warning: File {fasta_file} not found")
     
     print(f"Created master FASTA file: {output_file}")
-    return len(all_records)
+    return record_count
 
-def create_overlap_excel(protein_sets, protein_info_dicts, protein_sequences_dicts, protein_genes_dicts, labels, output_file="protein_overlaps.xlsx"):
+def write_excel_sheet(workbook, sheet_name, columns):
+    """Write a dict of header -> column values to a new xlsxwriter worksheet"""
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, list(columns))
+    # constant_memory mode flushes row by row, so transpose the columns back into rows
+    for row_idx, row in enumerate(zip(*columns.values()), start=1):
+        # Missing CSV values come through as NaN; leave those cells blank like pandas did
+        worksheet.write_row(row_idx, 0, [None if value != value else value for value in row])
+
+def create_overlap_excel(regions, protein_info_dicts, protein_sequences_dicts, protein_genes_dicts, labels, output_file="protein_overlaps.xlsx"):
     """Create Excel file with multiple sheets for different protein overlaps"""
-    with pd.ExcelWriter(output_file) as writer:
+    all_three = regions["all_three"]
+    p1_p2 = regions["p1_p2"]
+    p1_p3 = regions["p1_p3"]
+    p2_p3 = regions["p2_p3"]
+    
+    def genes(proteins, i):
+        return [protein_genes_dicts[i].get(protein, 'No gene information available') for protein in proteins]
+    
+    def descriptions(proteins, i):
+        return [protein_info_dicts[i].get(protein, 'No description available') for protein in proteins]
+    
+    def sequences(proteins, i):
+        return [protein_sequences_dicts[i].get(protein, 'Sequence not available') for protein in proteins]
+    
+    workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+    try:
         # Sheet 1: All three papers overlap
-        all_three = sorted(protein_sets[0] & protein_sets[1] & protein_sets[2])
-        data_all_three = []
-        for protein in all_three:
-            data_all_three.append({
-                'Protein Accession': protein,
-                'Gene': protein_genes_dicts[0].get(protein, 'No gene information available'),
-                'Paper 1 Description': protein_info_dicts[0].get(protein, 'No description available'),
-                'Paper 2 Description': protein_info_dicts[1].get(protein, 'No description available'),
-                'Paper 3 Description': protein_info_dicts[2].get(protein, 'No description available'),
-                'Amino Acid Sequence': protein_sequences_dicts[0].get(protein, 'Sequence not available')
-            })
-        pd.DataFrame(data_all_three).to_excel(writer, sheet_name='All Three Papers', index=False)
+        write_excel_sheet(workbook, 'All Three Papers', {
+            'Protein Accession': all_three,
+            'Gene': genes(all_three, 0),
+            'Paper 1 Description': descriptions(all_three, 0),
+            'Paper 2 Description': descriptions(all_three, 1),
+            'Paper 3 Description': descriptions(all_three, 2),
+            'Amino Acid Sequence': sequences(all_three, 0),
+        })
         
         # Sheet 2: Paper 1 and 2 overlap
-        p1_p2 = sorted(protein_sets[0] & protein_sets[1] - protein_sets[2])
-        data_p1_p2 = []
-        for protein in p1_p2:
-            data_p1_p2.append({
-                'Protein Accession': protein,
-                'Gene': protein_genes_dicts[0].get(protein, 'No gene information available'),
-                'Paper 1 Description': protein_info_dicts[0].get(protein, 'No description available'),
-                'Paper 2 Description': protein_info_dicts[1].get(protein, 'No description available'),
-                'Amino Acid Sequence': protein_sequences_dicts[0].get(protein, 'Sequence not available')
-            })
-        pd.DataFrame(data_p1_p2).to_excel(writer, sheet_name='Paper 1 and 2', index=False)
+        write_excel_sheet(workbook, 'Paper 1 and 2', {
+            'Protein Accession': p1_p2,
+            'Gene': genes(p1_p2, 0),
+            'Paper 1 Description': descriptions(p1_p2, 0),
+            'Paper 2 Description': descriptions(p1_p2, 1),
+            'Amino Acid Sequence': sequences(p1_p2, 0),
+        })
         
         # Sheet 3: Paper 1 and 3 overlap
-        p1_p3 = sorted(protein_sets[0] & protein_sets[2] - protein_sets[1])
-        data_p1_p3 = []
-        for protein in p1_p3:
-            data_p1_p3.append({
-                'Protein Accession': protein,
-                'Gene': protein_genes_dicts[0].get(protein, 'No gene information available'),
-                'Paper 1 Description': protein_info_dicts[0].get(protein, 'No description available'),
-                'Paper 3 Description': protein_info_dicts[2].get(protein, 'No description available'),
-                'Amino Acid Sequence': protein_sequences_dicts[0].get(protein, 'Sequence not available')
-            })
-        pd.DataFrame(data_p1_p3).to_excel(writer, sheet_name='Paper 1 and 3', index=False)
+        write_excel_sheet(workbook, 'Paper 1 and 3', {
+            'Protein Accession': p1_p3,
+            'Gene': genes(p1_p3, 0),
+            'Paper 1 Description': descriptions(p1_p3, 0),
+            'Paper 3 Description': descriptions(p1_p3, 2),
+            'Amino Acid Sequence': sequences(p1_p3, 0),
+        })
         
         # Sheet 4: Paper 2 and 3 overlap
-        p2_p3 = sorted(protein_sets[1] & protein_sets[2] - protein_sets[0])
-        data_p2_p3 = []
-        for protein in p2_p3:
-            data_p2_p3.append({
-                'Protein Accession': protein,
-                'Gene': protein_genes_dicts[1].get(protein, 'No gene information available'),
-                'Paper 2 Description': protein_info_dicts[1].get(protein, 'No description available'),
-                'Paper 3 Description': protein_info_dicts[2].get(protein, 'No description available'),
-                'Amino Acid Sequence': protein_sequences_dicts[1].get(protein, 'Sequence not available')
-            })
-        pd.DataFrame(data_p2_p3).to_excel(writer, sheet_name='Paper 2 and 3', index=False)
+        write_excel_sheet(workbook, 'Paper 2 and 3', {
+            'Protein Accession': p2_p3,
+            'Gene': genes(p2_p3, 1),
+            'Paper 2 Description': descriptions(p2_p3, 1),
+            'Paper 3 Description': descriptions(p2_p3, 2),
+            'Amino Acid Sequence': sequences(p2_p3, 1),
+        })
+    finally:
+        workbook.close()
 
-def analyze_overlaps(protein_sets, protein_info_dicts, protein_sequences_dicts, protein_genes_dicts, labels):
+def analyze_overlaps(protein_sets, regions, protein_info_dicts, protein_sequences_dicts, protein_genes_dicts, labels, plot=True):
     """Analyze overlaps between protein sets and create visualizations with descriptions"""
     # Create Venn diagram
-    plt.figure(figsize=(10, 8))
-    venn3(protein_sets, labels)
-    plt.title("Protein Overlap Between Datasets")
-    plt.savefig("protein_overlaps_venn.png")
-    plt.close()
+    if plot:
+        plt.figure(figsize=(10, 8))
+        venn3(protein_sets, labels)
+        plt.title("Protein Overlap Between Datasets")
+        # Fixed dpi and no tight bbox avoid the extra layout render pass
+        plt.savefig("protein_overlaps_venn.png", dpi=100, bbox_inches=None, pad_inches=0)
+        plt.close()
 
-    # Calculate overlaps
+    # Calculate overlaps from the precomputed regions
     overlaps = {
-        f"{labels[0]} only": len(protein_sets[0] - protein_sets[1] - protein_sets[2]),
-        f"{labels[1]} only": len(protein_sets[1] - protein_sets[0] - protein_sets[2]),
-        f"{labels[2]} only": len(protein_sets[2] - protein_sets[0] - protein_sets[1]),
-        f"{labels[0]} and {labels[1]} only": len(protein_sets[0] & protein_sets[1] - protein_sets[2]),
-        f"{labels[0]} and {labels[2]} only": len(protein_sets[0] & protein_sets[2] - protein_sets[1]),
-        f"{labels[1]} and {labels[2]} only": len(protein_sets[1] & protein_sets[2] - protein_sets[0]),
-        "All three": len(protein_sets[0] & protein_sets[1] & protein_sets[2])
+        f"{labels[0]} only": len(regions["p1_only"]),
+        f"{labels[1]} only": len(regions["p2_only"]),
+        f"{labels[2]} only": len(regions["p3_only"]),
+        f"{labels[0]} and {labels[1]} only": len(regions["p1_p2"]),
+        f"{labels[0]} and {labels[2]} only": len(regions["p1_p3"]),
+        f"{labels[1]} and {labels[2]} only": len(regions["p2_p3"]),
+        "All three": len(regions["all_three"])
     }
 
-    # Save detailed overlap information with descriptions
-    with open("protein_overlaps.txt", "w") as f:
-        f.write("Protein Overlap Analysis\n")
-        f.write("======================\n\n")
-        
-        # Write summary statistics
-        for label, count in overlaps.items():
-            f.write(f"{label}: {count} proteins\n")
-        
-        f.write("\nDetailed Overlap Information\n")
-        f.write("==========================\n\n")
-        
-        # Write detailed overlap information with descriptions
-        f.write(f"Proteins in all three datasets:\n")
-        for protein in sorted(protein_sets[0] & protein_sets[1] & protein_sets[2]):
-            descriptions = []
-            for info_dict in protein_info_dicts:
-                desc = info_dict.get(protein, "No description available")
-                descriptions.append(desc)
-            f.write(f"{protein}\n")
-            f.write(f"  Gene: {protein_genes_dicts[0].get(protein, 'No gene information available')}\n")
-            f.write(f"  Paper 1: {descriptions[0]}\n")
-            f.write(f"  Paper 2: {descriptions[1]}\n")
-            f.write(f"  Paper 3: {descriptions[2]}\n\n")
-        
-        f.write(f"\nProteins in {labels[0]} and {labels[1]} only:\n")
-        for protein in sorted(protein_sets[0] & protein_sets[1] - protein_sets[2]):
-            f.write(f"{protein}\n")
-            f.write(f"  Gene: {protein_genes_dicts[0].get(protein, 'No gene information available')}\n")
-            f.write(f"  Paper 1: {protein_info_dicts[0].get(protein, 'No description available')}\n")
-            f.write(f"  Paper 2: {protein_info_dicts[1].get(protein, 'No description available')}\n\n")
-        
-        f.write(f"\nProteins in {labels[0]} and {labels[2]} only:\n")
-        for protein in sorted(protein_sets[0] & protein_sets[2] - protein_sets[1]):
-            f.write(f"{protein}\n")
-            f.write(f"  Gene: {protein_genes_dicts[0].get(protein, 'No gene information available')}\n")
-            f.write(f"  Paper 1: {protein_info_dicts[0].get(protein, 'No description available')}\n")
-            f.write(f"  Paper 3: {protein_info_dicts[2].get(protein, 'No description available')}\n\n")
-        
-        f.write(f"\nProteins in {labels[1]} and {labels[2]} only:\n")
-        for protein in sorted(protein_sets[1] & protein_sets[2] - protein_sets[0]):
-            f.write(f"{protein}\n")
-            f.write(f"  Gene: {protein_genes_dicts[1].get(protein, 'No gene information available')}\n")
-            f.write(f"  Paper 2: {protein_info_dicts[1].get(protein, 'No description available')}\n")
-            f.write(f"  Paper 3: {protein_info_dicts[2].get(protein, 'No description available')}\n\n")
+    # Save detailed overlap information with descriptions, assembled in memory
+    # and written with a single call
+    parts = ["Protein Overlap Analysis\n", "======================\n\n"]
+    
+    # Write summary statistics
+    for label, count in overlaps.items():
+        parts.append(f"{label}: {count} proteins\n")
+    
+    parts.append("\nDetailed Overlap Information\n")
+    parts.append("==========================\n\n")
+    
+    # Write detailed overlap information with descriptions
+    parts.append(f"Proteins in all three datasets:\n")
+    for protein in regions["all_three"]:
+        parts.append(
+            f"{protein}\n"
+            f"  Gene: {protein_genes_dicts[0].get(protein, 'No gene information available')}\n"
+            f"  Paper 1: {protein_info_dicts[0].get(protein, 'No description available')}\n"
+            f"  Paper 2: {protein_info_dicts[1].get(protein, 'No description available')}\n"
+            f"  Paper 3: {protein_info_dicts[2].get(protein, 'No description available')}\n\n"
+        )
+    
+    parts.append(f"\nProteins in {labels[0]} and {labels[1]} only:\n")
+    for protein in regions["p1_p2"]:
+        parts.append(
+            f"{protein}\n"
+            f"  Gene: {protein_genes_dicts[0].get(protein, 'No gene information available')}\n"
+            f"  Paper 1: {protein_info_dicts[0].get(protein, 'No description available')}\n"
+            f"  Paper 2: {protein_info_dicts[1].get(protein, 'No description available')}\n\n"
+        )
+    
+    parts.append(f"\nProteins in {labels[0]} and {labels[2]} only:\n")
+    for protein in regions["p1_p3"]:
+        parts.append(
+            f"{protein}\n"
+            f"  Gene: {protein_genes_dicts[0].get(protein, 'No gene information available')}\n"
+            f"  Paper 1: {protein_info_dicts[0].get(protein, 'No description available')}\n"
+            f"  Paper 3: {protein_info_dicts[2].get(protein, 'No description available')}\n\n"
+        )
+    
+    parts.append(f"\nProteins in {labels[1]} and {labels[2]} only:\n")
+    for protein in regions["p2_p3"]:
+        parts.append(
+            f"{protein}\n"
+            f"  Gene: {protein_genes_dicts[1].get(protein, 'No gene information available')}\n"
+            f"  Paper 2: {protein_info_dicts[1].get(protein, 'No description available')}\n"
+            f"  Paper 3: {protein_info_dicts[2].get(protein, 'No description available')}\n\n"
+        )
+    
+    # Binary mode with pre-encoded bytes skips the per-call TextIOWrapper encode path
+    with open("protein_overlaps.txt", "wb") as f:
+        f.write(''.join(parts).encode())
     
     # Create Excel file with multiple sheets
-    create_overlap_excel(protein_sets, protein_info_dicts, protein_sequences_dicts, protein_genes_dicts, labels)
+    create_overlap_excel(regions, protein_info_dicts, protein_sequences_dicts, protein_genes_dicts, labels)
 
 def main():
+    parser = argparse.ArgumentParser(description="Analyze protein overlaps between the three papers.")
+    parser.add_argument('--no-plot', action='store_true', help='Skip rendering the Venn diagram')
+    args = parser.parse_args()
+    
     # Define input files with correct paths
     fasta_files = [
         "/Users/conny/Desktop/AlphaFold/Summer Project/result/paper1_fasta_results.fasta",
@@ -202,8 +291,10 @@ def main():
     protein_info_dicts = []
     protein_sequences_dicts = []
     protein_genes_dicts = []
-    for fasta_file, csv_file in zip(fasta_files, csv_files):
-        protein_ids, protein_info, protein_sequences, protein_genes = read_fasta_and_csv_proteins(fasta_file, csv_file)
+    # The three file pairs are independent, so read them concurrently
+    with ThreadPoolExecutor(max_workers=len(fasta_files)) as executor:
+        file_results = list(executor.map(read_fasta_and_csv_proteins, fasta_files, csv_files))
+    for protein_ids, protein_info, protein_sequences, protein_genes in file_results:
         protein_sets.append(protein_ids)
         protein_info_dicts.append(protein_info)
         protein_sequences_dicts.append(protein_sequences)
@@ -217,10 +308,15 @@ def main():
     total_proteins = merge_fasta_files(fasta_files)
     print(f"Total unique proteins across all files: {total_proteins}")
     
+    # Compute the overlap regions once for the report and the Excel sheets
+    regions = compute_overlap_regions(protein_sets)
+    
     # Analyze overlaps with descriptions
-    analyze_overlaps(protein_sets, protein_info_dicts, protein_sequences_dicts, protein_genes_dicts, labels)
+    analyze_overlaps(protein_sets, regions, protein_info_dicts, protein_sequences_dicts, protein_genes_dicts, labels,
+                     plot=not args.no_plot)
     print("\nAnalysis complete! Check the following files:")
-    print("- protein_overlaps_venn.png (Venn diagram visualization)")
+    if not args.no_plot:
+        print("- protein_overlaps_venn.png (Venn diagram visualization)")
     print("- protein_overlaps.txt (Detailed overlap information with descriptions)")
     print("- protein_overlaps.xlsx (Excel file with multiple sheets for different overlaps)")
     print("- master_proteins.fasta (Merged FASTA file)")
@@ -1,64 +1,101 @@
 import pandas as pd
-from Bio import SeqIO
+import numpy as np
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pyroaring import FrozenBitMap
 
-def read_and_combine_csv_files():
+PAPER_CSV_FILES = {
+    'paper1': "/Users/conny/Desktop/AlphaFold/Summer Project/src/Aggregate/paper1_fasta_results.csv",
+    'paper2': "/Users/conny/Desktop/AlphaFold/Summer Project/src/Aggregate/paper2_fasta_results.csv",
+    'paper3': "/Users/conny/Desktop/AlphaFold/Summer Project/src/Aggregate/paper3_gene_results_finalfinal.csv",
+}
+MASTER_COLUMNS = ['gene', 'accession', 'protein_name']
+SOURCES = list(PAPER_CSV_FILES)
+
+def read_paper_csv(path):
     """
-    Read and combine the three CSV files into a master file, using only protein names
+    Read the gene, accession and protein_name columns of one paper CSV
     """
-    # Read the three CSV files
-    paper1_df = pd.read_csv("/Users/conny/Desktop/AlphaFold/Summer Project/src/Aggregate/paper1_fasta_results.csv")
-    paper2_df = pd.read_csv("/Users/conny/Desktop/AlphaFold/Summer Project/src/Aggregate/paper2_fasta_results.csv")
-    paper3_df = pd.read_csv("/Users/conny/Desktop/AlphaFold/Summer Project/src/Aggregate/paper3_gene_results_finalfinal.csv")
-    
-    # Select only relevant columns and rename for consistency
-    paper1_df = paper1_df[['gene', 'accession', 'protein_name']]
-    paper2_df = paper2_df[['gene', 'accession', 'protein_name']]
-    paper3_df = paper3_df[['gene', 'accession', 'protein_name']]
+    return pd.read_csv(path, usecols=MASTER_COLUMNS, engine='pyarrow', dtype_backend='pyarrow')[MASTER_COLUMNS]
+
+def read_and_combine_csv_files(write_csv=False):
+    """
+    Read and combine the three CSV files into a master file, using only protein names.
+    The master file is written as Parquet, plus CSV when write_csv is set.
+    """
+    # Read only the three needed columns of each CSV, straight into Arrow-backed strings,
+    # and keep them in gene, accession, protein_name order. The three reads run
+    # concurrently; file I/O and the Arrow parser both release the GIL.
+    with ThreadPoolExecutor(max_workers=len(PAPER_CSV_FILES)) as executor:
+        paper1_df, paper2_df, paper3_df = executor.map(read_paper_csv, PAPER_CSV_FILES.values())
     
-    # Add source column to each dataframe
-    paper1_df['source'] = 'paper1'
-    paper2_df['source'] = 'paper2'
-    paper3_df['source'] = 'paper3'
+    # Add source column to each dataframe, as 1-byte category codes shared across all
+    # three so the column stays categorical through the concat
+    paper1_df['source'] = pd.Categorical.from_codes(np.full(len(paper1_df), 0, dtype=np.int8), categories=SOURCES)
+    paper2_df['source'] = pd.Categorical.from_codes(np.full(len(paper2_df), 1, dtype=np.int8), categories=SOURCES)
+    paper3_df['source'] = pd.Categorical.from_codes(np.full(len(paper3_df), 2, dtype=np.int8), categories=SOURCES)
     
     # Combine all dataframes
     master_df = pd.concat([paper1_df, paper2_df, paper3_df], ignore_index=True)
     
     # Remove duplicates based on gene name
-    master_df = master_df.drop_duplicates(subset=['gene'])
+    master_df = master_df.drop_duplicates(subset=['gene'], keep='first')
     
     # Save master file
-    master_df.to_csv("master_proteins.csv", index=False)
+    master_df.to_parquet("master_proteins.parquet", engine='pyarrow', compression='zstd', index=False)
+    if write_csv:
+        master_df.to_csv("master_proteins.csv", index=False)
     print(f"Created master file with {len(master_df)} unique genes")
     
     return master_df
 
-def compare_with_dicer(master_df):
+def write_gene_list(path, header, genes):
+    """
+    Write a sorted one-column gene list as CSV; gene symbols need no quoting
+    """
+    with open(path, "w") as f:
+        f.write(header + "\n")
+        f.writelines(f"{gene}\n" for gene in sorted(genes))
+
+def compare_with_dicer(master_df, write_csv=False):
     """
     Compare master file with dicer candidates
     """
     # Read Dicer candidate genes
     dicer_df = pd.read_csv("/Users/conny/Desktop/AlphaFold/Summer Project/result/Dicer_candidates.tsv", sep="\t")
-    dicer_genes = set(dicer_df["GENE"].dropna().str.upper())
+    dicer_upper = dicer_df["GENE"].dropna().str.upper()
     
-    # Get genes from master file
-    master_genes = set(master_df['gene'].dropna().str.upper())
+    # Uppercase the master gene column once and reuse it for both the set and the row filter
+    gene_upper = master_df['gene'].str.upper()
+    master_upper = gene_upper.dropna()
     
-    # Find overlaps and differences
-    overlap = dicer_genes & master_genes
-    only_in_dicer = dicer_genes - master_genes
-    only_in_master = master_genes - dicer_genes
+    # Intern every gene name to an integer code, then compare the two gene sets as bitmaps
+    codes, uniques = pd.factorize(pd.concat([master_upper, dicer_upper], ignore_index=True))
+    master_genes = FrozenBitMap(codes[:len(master_upper)].tolist())
+    dicer_genes = FrozenBitMap(codes[len(master_upper):].tolist())
     
-    # Create detailed overlap dataframe
-    overlap_df = master_df[master_df['gene'].str.upper().isin(overlap)].copy()
-    overlap_df['in_dicer'] = True
+    # Find overlaps and differences, mapped back to gene names
+    overlap_codes = master_genes & dicer_genes
+    overlap = uniques[list(overlap_codes)]
+    only_in_dicer = uniques[list(dicer_genes - master_genes)]
+    only_in_master = uniques[list(master_genes - dicer_genes)]
     
-    # Save detailed results
-    overlap_df.to_csv("dicer_master_overlap_detailed.csv", index=False)
+    # Create detailed overlap dataframe; with no overlap skip the row scan and keep just the header
+    if overlap_codes:
+        overlap_df = master_df[gene_upper.isin(overlap)].copy()
+        overlap_df['in_dicer'] = True
+    else:
+        overlap_df = master_df.iloc[:0].assign(in_dicer=pd.Series(dtype=bool))
+    
+    # Save detailed results; Parquet is the canonical copy, CSV only for inspection
+    overlap_df.to_parquet("dicer_master_overlap_detailed.parquet", engine='pyarrow', compression='zstd', index=False)
+    if write_csv:
+        overlap_df.to_csv("dicer_master_overlap_detailed.csv", index=False)
     
     # Save summary results
-    pd.DataFrame({"overlap": sorted(overlap)}).to_csv("dicer_master_overlap.csv", index=False)
-    pd.DataFrame({"only_in_dicer": sorted(only_in_dicer)}).to_csv("dicer_only.csv", index=False)
-    pd.DataFrame({"only_in_master": sorted(only_in_master)}).to_csv("master_only.csv", index=False)
+    write_gene_list("dicer_master_overlap.csv", "overlap", overlap)
+    write_gene_list("dicer_only.csv", "only_in_dicer", only_in_dicer)
+    write_gene_list("master_only.csv", "only_in_master", only_in_master)
     
     # Print summary
     print("\nComparison Results:")
@@ -69,18 +106,24 @@ def compare_with_dicer(master_df):
     print(f"Number only in master: {len(only_in_master)}")
     
     print("\nResults saved:")
-    print("- master_proteins.csv: Combined data from all three papers (gene, accession, protein_name)")
-    print("- dicer_master_overlap_detailed.csv: Detailed information for overlapping genes")
+    print("- master_proteins.parquet: Combined data from all three papers (gene, accession, protein_name)")
+    print("- dicer_master_overlap_detailed.parquet: Detailed information for overlapping genes")
+    if write_csv:
+        print("- master_proteins.csv, dicer_master_overlap_detailed.csv: CSV copies of the two files above")
     print("- dicer_master_overlap.csv: List of overlapping gene names")
     print("- dicer_only.csv: Genes only in Dicer file")
     print("- master_only.csv: Genes only in master file")
 
 def main():
+    parser = argparse.ArgumentParser(description="Compare the combined paper proteins with the Dicer candidates.")
+    parser.add_argument('--csv', action='store_true', help='Also write CSV copies of the master and detailed overlap files')
+    args = parser.parse_args()
+    
     # Create master file
-    master_df = read_and_combine_csv_files()
+    master_df = read_and_combine_csv_files(write_csv=args.csv)
     
     # Compare with dicer file
-    compare_with_dicer(master_df)
+    compare_with_dicer(master_df, write_csv=args.csv)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
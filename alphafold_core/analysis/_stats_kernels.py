@@ -0,0 +1,101 @@
+"""
+Numeric kernels for the statistics module
+Column-wise moment sweeps, compiled with Numba when it is installed
+"""
+
+import warnings
+import numpy as np
+from functools import lru_cache
+
+
+def _col_moments_numpy(X: np.ndarray):
+    """NaN-aware column moments with vectorized NumPy reductions"""
+    valid = ~np.isnan(X)
+    count = valid.sum(axis=0)
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        # All-NaN columns give NaN mean/min/max; silence the warnings NumPy raises for them
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(X, axis=0)
+        minimum = np.nanmin(X, axis=0)
+        maximum = np.nanmax(X, axis=0)
+    
+    deviations = np.where(valid, X - mean, 0.0)
+    squared = deviations * deviations
+    m2 = squared.sum(axis=0)
+    m3 = (squared * deviations).sum(axis=0)
+    m4 = (squared * squared).sum(axis=0)
+    return count, mean, m2, m3, m4, minimum, maximum
+
+
+@lru_cache(maxsize=None)
+def _col_moments_numba():
+    """Compile the Numba column-moment kernel on first use, or None without numba"""
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    # fastmath is left off: it lets LLVM assume no NaNs and drop the isnan checks
+    @njit(parallel=True, cache=True)
+    def col_moments_kernel(X):
+        n_rows, n_cols = X.shape
+        count = np.zeros(n_cols, dtype=np.int64)
+        mean = np.full(n_cols, np.nan)
+        m2 = np.zeros(n_cols)
+        m3 = np.zeros(n_cols)
+        m4 = np.zeros(n_cols)
+        minimum = np.full(n_cols, np.nan)
+        maximum = np.full(n_cols, np.nan)
+        
+        for j in prange(n_cols):
+            # One streaming pass per column: running mean and central moment sums
+            n = 0
+            mu = 0.0
+            M2 = 0.0
+            M3 = 0.0
+            M4 = 0.0
+            lo = np.inf
+            hi = -np.inf
+            for i in range(n_rows):
+                x = X[i, j]
+                if np.isnan(x):
+                    continue
+                n1 = n
+                n += 1
+                delta = x - mu
+                delta_n = delta / n
+                delta_n2 = delta_n * delta_n
+                term1 = delta * delta_n * n1
+                mu += delta_n
+                M4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * M2 - 4 * delta_n * M3
+                M3 += term1 * delta_n * (n - 2) - 3 * delta_n * M2
+                M2 += term1
+                if x < lo:
+                    lo = x
+                if x > hi:
+                    hi = x
+            
+            count[j] = n
+            if n > 0:
+                mean[j] = mu
+                m2[j] = M2
+                m3[j] = M3
+                m4[j] = M4
+                minimum[j] = lo
+                maximum[j] = hi
+        
+        return count, mean, m2, m3, m4, minimum, maximum
+    
+    return col_moments_kernel
+
+
+def col_moments(X: np.ndarray):
+    """
+    Per-column count, mean, central moment sums (m2, m3, m4), min and max of a
+    2-D float64 array, ignoring NaNs. Columns with no values get NaN mean/min/max.
+    """
+    kernel = _col_moments_numba()
+    if kernel is None:
+        return _col_moments_numpy(X)
+    # Column-major storage keeps each column's sweep on contiguous memory
+    return kernel(np.asfortranarray(X, dtype=np.float64))
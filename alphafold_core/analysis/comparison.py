@@ -3,12 +3,12 @@ Comparison analysis module for AlphaFold Core
 Handles comparison of different AlphaFold datasets and results
 """
 
+import io
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from collections import Counter
 from typing import Dict, List, Optional, Union, Tuple, Any
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 from ..config import config
 from ..utils import setup_logging, load_dataframe, save_dataframe
@@ -20,6 +20,21 @@ class ComparisonAnalyzer:
     def __init__(self):
         self.logger = setup_logging()
     
+    def _summary_statistics(self, df: pd.DataFrame, columns: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Summary statistics for the given columns of df in a single agg call"""
+        present = [column for column in columns if column in df.columns]
+        if not present:
+            return {}
+        
+        stats = df[present].agg(['count', 'mean', 'median', 'std', 'min', 'max'])
+        summary = {}
+        for column in present:
+            column_stats = stats[column]
+            count = int(column_stats['count'])
+            if count > 0:
+                summary[column] = {'count': count, **column_stats.drop('count').to_dict()}
+        return summary
+    
     def compare_datasets(self, datasets: Dict[str, pd.DataFrame],
                         comparison_columns: List[str] = None) -> Dict[str, Any]:
         """Compare multiple datasets across specified columns"""
@@ -30,8 +45,15 @@ class ComparisonAnalyzer:
                 all_columns.update(df.select_dtypes(include=[np.number]).columns)
             comparison_columns = list(all_columns)
         
+        # Dataset names and, per column, the datasets that carry it are fixed for
+        # the rest of the method, so work them out once
+        names = tuple(datasets.keys())
+        items = tuple(datasets.items())
+        col_presence = {column: [name for name, df in items if column in df.columns]
+                        for column in comparison_columns}
+        
         comparison_results = {
-            'datasets': list(datasets.keys()),
+            'datasets': list(names),
             'comparison_columns': comparison_columns,
             'summary_statistics': {},
             'correlations': {},
@@ -39,41 +61,26 @@ class ComparisonAnalyzer:
         }
         
         # Calculate summary statistics for each dataset
-        for dataset_name, df in datasets.items():
-            comparison_results['summary_statistics'][dataset_name] = {}
-            for column in comparison_columns:
-                if column in df.columns:
-                    data = df[column].dropna()
-                    if len(data) > 0:
-                        comparison_results['summary_statistics'][dataset_name][column] = {
-                            'count': len(data),
-                            'mean': data.mean(),
-                            'median': data.median(),
-                            'std': data.std(),
-                            'min': data.min(),
-                            'max': data.max()
-                        }
-        
-        # Calculate correlations between datasets for each column
-        for column in comparison_columns:
-            column_data = {}
-            for dataset_name, df in datasets.items():
-                if column in df.columns:
-                    column_data[dataset_name] = df[column].dropna()
-            
-            if len(column_data) > 1:
-                # Create correlation matrix
-                min_length = min(len(data) for data in column_data.values())
+        for dataset_name, df in items:
+            comparison_results['summary_statistics'][dataset_name] = self._summary_statistics(df, comparison_columns)
+        
+        # Calculate correlations between datasets for each column, over the first
+        # min_length non-null values of each dataset. Every shared column of every
+        # dataset goes into one wide (dataset, column) frame built with a single
+        # concat; rows are aligned by the original index labels.
+        min_lengths = {column: min(int(datasets[name][column].count()) for name in present)
+                       for column, present in col_presence.items() if len(present) > 1}
+        wide_parts = {(name, column): datasets[name][column].dropna().head(min_length)
+                      for column, min_length in min_lengths.items() if min_length > 0
+                      for name in col_presence[column]}
+        if wide_parts:
+            wide = pd.concat(wide_parts, axis=1)
+            for column, min_length in min_lengths.items():
                 if min_length > 0:
-                    # Pad shorter series with NaN
-                    padded_data = {}
-                    for name, data in column_data.items():
-                        if len(data) < min_length:
-                            padded_data[name] = pd.concat([data, pd.Series([np.nan] * (min_length - len(data)))])
-                        else:
-                            padded_data[name] = data.head(min_length)
-                    
-                    correlation_df = pd.DataFrame(padded_data)
+                    # Create correlation matrix; rows outside this column's labels are
+                    # all-NaN here and drop out of the pairwise-complete corr
+                    correlation_df = wide[[(name, column) for name in col_presence[column]]]
+                    correlation_df = correlation_df.droplevel(1, axis=1)
                     comparison_results['correlations'][column] = correlation_df.corr().to_dict()
         
         return comparison_results
@@ -99,32 +106,23 @@ class ComparisonAnalyzer:
         }
         
         for dataset_name, df in datasets.items():
-            quality_comparison['quality_summary'][dataset_name] = {}
+            # Basic statistics
+            quality_summary = self._summary_statistics(df, quality_columns)
+            quality_comparison['quality_summary'][dataset_name] = quality_summary
             quality_comparison['threshold_analysis'][dataset_name] = {}
             
-            for metric in quality_columns:
-                if metric in df.columns:
-                    data = df[metric].dropna()
-                    if len(data) > 0:
-                        # Basic statistics
-                        quality_comparison['quality_summary'][dataset_name][metric] = {
-                            'count': len(data),
-                            'mean': data.mean(),
-                            'median': data.median(),
-                            'std': data.std(),
-                            'min': data.min(),
-                            'max': data.max()
-                        }
-                        
-                        # Threshold analysis
-                        if metric in thresholds:
-                            threshold = thresholds[metric]
-                            above_threshold = (data >= threshold).sum()
-                            quality_comparison['threshold_analysis'][dataset_name][metric] = {
-                                'threshold': threshold,
-                                'above_threshold_count': above_threshold,
-                                'above_threshold_percentage': (above_threshold / len(data)) * 100
-                            }
+            # Threshold analysis, one broadcast comparison for all thresholded metrics
+            threshold_metrics = [metric for metric in quality_summary if metric in thresholds]
+            if threshold_metrics:
+                threshold_values = pd.Series({metric: thresholds[metric] for metric in threshold_metrics})
+                above_counts = (df[threshold_metrics] >= threshold_values).sum()
+                for metric in threshold_metrics:
+                    above_threshold = above_counts[metric]
+                    quality_comparison['threshold_analysis'][dataset_name][metric] = {
+                        'threshold': thresholds[metric],
+                        'above_threshold_count': above_threshold,
+                        'above_threshold_percentage': (above_threshold / quality_summary[metric]['count']) * 100
+                    }
         
         return quality_comparison
     
@@ -150,110 +148,128 @@ class ComparisonAnalyzer:
                 dataset_ids[dataset_name] = ids
                 count_comparison['prediction_counts'][dataset_name] = len(ids)
         
-        # Calculate overlaps
+        # Calculate overlaps; the union size follows from the intersection
         dataset_names = list(dataset_ids.keys())
+        intersection_sizes = self._pairwise_intersection_sizes([dataset_ids[name] for name in dataset_names])
         for i, name1 in enumerate(dataset_names):
             for j, name2 in enumerate(dataset_names[i+1:], i+1):
                 overlap_key = f"{name1}_vs_{name2}"
                 set1 = dataset_ids[name1]
                 set2 = dataset_ids[name2]
                 
-                intersection = set1.intersection(set2)
-                union = set1.union(set2)
+                intersection_size = int(intersection_sizes[i, j])
+                union_size = len(set1) + len(set2) - intersection_size
                 
                 count_comparison['overlaps'][overlap_key] = {
-                    'intersection_size': len(intersection),
-                    'union_size': len(union),
-                    'jaccard_similarity': len(intersection) / len(union) if union else 0,
-                    'overlap_percentage_set1': len(intersection) / len(set1) * 100 if set1 else 0,
-                    'overlap_percentage_set2': len(intersection) / len(set2) * 100 if set2 else 0
+                    'intersection_size': intersection_size,
+                    'union_size': union_size,
+                    'jaccard_similarity': intersection_size / union_size if union_size else 0,
+                    'overlap_percentage_set1': intersection_size / len(set1) * 100 if set1 else 0,
+                    'overlap_percentage_set2': intersection_size / len(set2) * 100 if set2 else 0
                 }
         
-        # Find unique predictions
-        all_ids = set().union(*dataset_ids.values())
+        # Find unique predictions: count how many datasets hold each id once,
+        # then an id is unique to a dataset when that count is 1
+        id_counts = Counter()
+        for ids in dataset_ids.values():
+            id_counts.update(ids)
+        
         for dataset_name, ids in dataset_ids.items():
-            other_ids = set().union(*[dataset_ids[name] for name in dataset_names if name != dataset_name])
-            unique_ids = ids - other_ids
+            unique_count = sum(1 for x in ids if id_counts[x] == 1)
             count_comparison['unique_predictions'][dataset_name] = {
-                'unique_count': len(unique_ids),
-                'unique_percentage': len(unique_ids) / len(ids) * 100 if ids else 0
+                'unique_count': unique_count,
+                'unique_percentage': unique_count / len(ids) * 100 if ids else 0
             }
         
         return count_comparison
     
+    def _pairwise_intersection_sizes(self, id_sets: List[set]) -> np.ndarray:
+        """Matrix of |A_i & A_j| for every pair of id sets"""
+        k = len(id_sets)
+        try:
+            from scipy import sparse
+        except ImportError:
+            # Without SciPy, probe each pair from the smaller set
+            sizes = np.zeros((k, k), dtype=np.int64)
+            for i in range(k):
+                sizes[i, i] = len(id_sets[i])
+                for j in range(i + 1, k):
+                    small, large = sorted((id_sets[i], id_sets[j]), key=len)
+                    sizes[i, j] = sizes[j, i] = sum(1 for x in small if x in large)
+            return sizes
+        
+        # Dataset x id incidence matrix; M @ M.T holds every intersection size at once
+        lengths = [len(ids) for ids in id_sets]
+        if k == 0 or sum(lengths) == 0:
+            return np.diag(lengths).astype(np.int64)
+        all_ids = np.fromiter((x for ids in id_sets for x in ids), dtype=object, count=sum(lengths))
+        columns, uniques = pd.factorize(all_ids)
+        rows = np.repeat(np.arange(k), lengths)
+        incidence = sparse.csr_matrix((np.ones(len(columns), dtype=np.int64), (rows, columns)),
+                                      shape=(k, len(uniques)))
+        return (incidence @ incidence.T).toarray()
+    
     def create_comparison_report(self, comparison_results: Dict[str, Any],
-                               output_file: str = "comparison_report.txt") -> str:
+                               output_file: str = "comparison_report.txt",
+                               return_text: bool = True) -> Optional[str]:
         """Generate a comprehensive comparison report"""
-        report = []
-        report.append("Dataset Comparison Report")
-        report.append("=" * 40)
-        report.append("")
-        
-        # Dataset overview
-        report.append(f"Datasets compared: {', '.join(comparison_results['datasets'])}")
-        report.append("")
-        
-        # Summary statistics
-        if 'summary_statistics' in comparison_results:
-            report.append("Summary Statistics:")
-            for dataset_name, stats in comparison_results['summary_statistics'].items():
-                report.append(f"  {dataset_name}:")
-                for column, column_stats in stats.items():
-                    report.append(f"    {column}: mean={column_stats['mean']:.3f}, std={column_stats['std']:.3f}")
-                report.append("")
-        
-        # Quality comparison
-        if 'quality_summary' in comparison_results:
-            report.append("Quality Metrics Comparison:")
-            for dataset_name, quality_stats in comparison_results['quality_summary'].items():
-                report.append(f"  {dataset_name}:")
-                for metric, stats in quality_stats.items():
-                    report.append(f"    {metric}: mean={stats['mean']:.3f}, median={stats['median']:.3f}")
-                report.append("")
-        
-        # Prediction counts
-        if 'prediction_counts' in comparison_results:
-            report.append("Prediction Counts:")
-            for dataset_name, count in comparison_results['prediction_counts'].items():
-                report.append(f"  {dataset_name}: {count} predictions")
-            report.append("")
-        
-        # Overlaps
-        if 'overlaps' in comparison_results:
-            report.append("Dataset Overlaps:")
-            for overlap_key, overlap_stats in comparison_results['overlaps'].items():
-                report.append(f"  {overlap_key}:")
-                report.append(f"    - Intersection: {overlap_stats['intersection_size']}")
-                report.append(f"    - Jaccard similarity: {overlap_stats['jaccard_similarity']:.3f}")
-                report.append("")
-        
-        # Save report
+        # Stream the report to the file; only keep an in-memory copy when the caller wants the text back
+        buffer = io.StringIO() if return_text else None
         with open(output_file, 'w') as f:
-            f.write('\n'.join(report))
+            def write(text: str):
+                f.write(text)
+                if buffer is not None:
+                    buffer.write(text)
+            
+            write("Dataset Comparison Report\n" + "=" * 40 + "\n\n")
+            
+            # Dataset overview
+            write(f"Datasets compared: {', '.join(comparison_results['datasets'])}\n\n")
+            
+            # Summary statistics
+            if 'summary_statistics' in comparison_results:
+                write("Summary Statistics:\n")
+                for dataset_name, stats in comparison_results['summary_statistics'].items():
+                    write(f"  {dataset_name}:\n" + "".join(
+                        f"    {column}: mean={column_stats['mean']:.3f}, std={column_stats['std']:.3f}\n"
+                        for column, column_stats in stats.items()) + "\n")
+            
+            # Quality comparison
+            if 'quality_summary' in comparison_results:
+                write("Quality Metrics Comparison:\n")
+                for dataset_name, quality_stats in comparison_results['quality_summary'].items():
+                    write(f"  {dataset_name}:\n" + "".join(
+                        f"    {metric}: mean={stats['mean']:.3f}, median={stats['median']:.3f}\n"
+                        for metric, stats in quality_stats.items()) + "\n")
+            
+            # Prediction counts
+            if 'prediction_counts' in comparison_results:
+                write("Prediction Counts:\n" + "".join(
+                    f"  {dataset_name}: {count} predictions\n"
+                    for dataset_name, count in comparison_results['prediction_counts'].items()) + "\n")
+            
+            # Overlaps
+            if 'overlaps' in comparison_results:
+                write("Dataset Overlaps:\n")
+                for overlap_key, overlap_stats in comparison_results['overlaps'].items():
+                    write(f"  {overlap_key}:\n"
+                          f"    - Intersection: {overlap_stats['intersection_size']}\n"
+                          f"    - Jaccard similarity: {overlap_stats['jaccard_similarity']:.3f}\n\n")
         
         self.logger.info(f"Comparison report saved to {output_file}")
-        return '\n'.join(report)
+        return buffer.getvalue() if buffer is not None else None
     
     def plot_comparison_summary(self, comparison_results: Dict[str, Any],
                               output_file: str = "comparison_summary.png",
-                              figsize: Tuple[int, int] = (15, 12)):
-        """Create comprehensive comparison visualization"""
-        fig, axes = plt.subplots(2, 2, figsize=figsize)
-        axes = axes.flatten()
-        
-        # Plot 1: Prediction counts
-        if 'prediction_counts' in comparison_results:
-            datasets = list(comparison_results['prediction_counts'].keys())
-            counts = list(comparison_results['prediction_counts'].values())
-            
-            axes[0].bar(datasets, counts)
-            axes[0].set_title('Prediction Counts by Dataset')
-            axes[0].set_ylabel('Number of Predictions')
-            axes[0].tick_params(axis='x', rotation=45)
-        
-        # Plot 2: Quality metrics comparison
+                              figsize: Tuple[int, int] = (15, 12),
+                              dpi: int = 150) -> bool:
+        """Create comprehensive comparison visualization; returns whether a figure was written"""
+        # Plotting libraries are imported on first use so the compare_* methods stay light
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        quality_data = []
         if 'quality_summary' in comparison_results:
-            quality_data = []
             for dataset_name, quality_stats in comparison_results['quality_summary'].items():
                 for metric, stats in quality_stats.items():
                     quality_data.append({
@@ -261,42 +277,67 @@ class ComparisonAnalyzer:
                         'metric': metric,
                         'mean': stats['mean']
                     })
+        
+        # Only lay out panels that have data to draw
+        has_counts = 'prediction_counts' in comparison_results
+        has_quality = bool(quality_data)
+        has_overlaps = 'overlaps' in comparison_results
+        has_unique = 'unique_predictions' in comparison_results
+        n_panels = has_counts + has_quality + has_overlaps + has_unique
+        if n_panels == 0:
+            self.logger.warning("No comparison data available for plotting")
+            return False
+        
+        nrows, ncols = (1, n_panels) if n_panels <= 2 else (2, 2)
+        fig, axes = plt.subplots(nrows, ncols, figsize=(figsize[0], figsize[1] * nrows / 2),
+                                 squeeze=False, constrained_layout=True)
+        axes = list(axes.flatten())
+        for unused_ax in axes[n_panels:]:
+            unused_ax.remove()
+        axes = iter(axes)
+        
+        # Plot 1: Prediction counts
+        if has_counts:
+            ax = next(axes)
+            datasets = list(comparison_results['prediction_counts'].keys())
+            counts = list(comparison_results['prediction_counts'].values())
             
-            if quality_data:
-                quality_df = pd.DataFrame(quality_data)
-                pivot_df = quality_df.pivot(index='dataset', columns='metric', values='mean')
-                pivot_df.plot(kind='bar', ax=axes[1])
-                axes[1].set_title('Mean Quality Metrics by Dataset')
-                axes[1].set_ylabel('Mean Value')
-                axes[1].legend(title='Metric')
-                axes[1].tick_params(axis='x', rotation=45)
+            ax.bar(datasets, counts)
+            ax.set_title('Prediction Counts by Dataset')
+            ax.set_ylabel('Number of Predictions')
+            ax.tick_params(axis='x', rotation=45)
+        
+        # Plot 2: Quality metrics comparison
+        if has_quality:
+            ax = next(axes)
+            quality_df = pd.DataFrame(quality_data)
+            pivot_df = quality_df.pivot(index='dataset', columns='metric', values='mean')
+            pivot_df.plot(kind='bar', ax=ax)
+            ax.set_title('Mean Quality Metrics by Dataset')
+            ax.set_ylabel('Mean Value')
+            ax.legend(title='Metric')
+            ax.tick_params(axis='x', rotation=45)
         
         # Plot 3: Overlap heatmap
-        if 'overlaps' in comparison_results:
-            # Create overlap matrix
+        if has_overlaps:
+            ax = next(axes)
+            # Create overlap matrix as a float array, filling both triangles from each pair
             datasets = comparison_results['datasets']
-            overlap_matrix = pd.DataFrame(index=datasets, columns=datasets)
-            
+            overlaps = comparison_results['overlaps']
+            matrix = np.eye(len(datasets))
             for i, dataset1 in enumerate(datasets):
-                for j, dataset2 in enumerate(datasets):
-                    if i == j:
-                        overlap_matrix.loc[dataset1, dataset2] = 1.0
-                    else:
-                        overlap_key = f"{dataset1}_vs_{dataset2}"
-                        if overlap_key in comparison_results['overlaps']:
-                            overlap_matrix.loc[dataset1, dataset2] = comparison_results['overlaps'][overlap_key]['jaccard_similarity']
-                        else:
-                            overlap_key = f"{dataset2}_vs_{dataset1}"
-                            if overlap_key in comparison_results['overlaps']:
-                                overlap_matrix.loc[dataset1, dataset2] = comparison_results['overlaps'][overlap_key]['jaccard_similarity']
-                            else:
-                                overlap_matrix.loc[dataset1, dataset2] = 0.0
+                for j in range(i + 1, len(datasets)):
+                    dataset2 = datasets[j]
+                    overlap_stats = overlaps.get(f"{dataset1}_vs_{dataset2}") or overlaps.get(f"{dataset2}_vs_{dataset1}")
+                    if overlap_stats is not None:
+                        matrix[i, j] = matrix[j, i] = overlap_stats['jaccard_similarity']
+            overlap_matrix = pd.DataFrame(matrix, index=datasets, columns=datasets)
             
-            sns.heatmap(overlap_matrix, annot=True, cmap='Blues', ax=axes[2])
-            axes[2].set_title('Dataset Overlap Matrix')
+            sns.heatmap(overlap_matrix, annot=True, cmap='Blues', ax=ax)
+            ax.set_title('Dataset Overlap Matrix')
         
         # Plot 4: Unique predictions
-        if 'unique_predictions' in comparison_results:
+        if has_unique:
             datasets = list(comparison_results['unique_predictions'].keys())
             unique_counts = [comparison_results['unique_predictions'][name]['unique_count'] for name in datasets]
             unique_percentages = [comparison_results['unique_predictions'][name]['unique_percentage'] for name in datasets]
@@ -304,7 +345,7 @@ class ComparisonAnalyzer:
             x = np.arange(len(datasets))
             width = 0.35
             
-            ax1 = axes[3]
+            ax1 = next(axes)
             ax2 = ax1.twinx()
             
             bars1 = ax1.bar(x - width/2, unique_counts, width, label='Unique Count', alpha=0.7)
@@ -321,11 +362,12 @@ class ComparisonAnalyzer:
             ax1.legend(loc='upper left')
             ax2.legend(loc='upper right')
         
-        plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.close()
+        # constrained_layout already fits the panels, so no tight bbox pass on save
+        fig.savefig(output_file, dpi=dpi)
+        plt.close(fig)
         
         self.logger.info(f"Comparison summary plot saved to {output_file}")
+        return True
     
     def compare_sequence_lengths(self, datasets: Dict[str, pd.DataFrame],
                                sequence_columns: Dict[str, str] = None) -> Dict[str, Any]:
@@ -342,18 +384,21 @@ class ComparisonAnalyzer:
         for dataset_name, df in datasets.items():
             seq_col = sequence_columns.get(dataset_name, 'sequence')
             if seq_col in df.columns:
-                lengths = df[seq_col].str.len().dropna()
+                lengths = np.fromiter((len(seq) for seq in df[seq_col].to_numpy() if isinstance(seq, str)),
+                                      dtype=np.int64)
                 
                 if len(lengths) > 0:
+                    # All order statistics from one percentile call
+                    min_length, q25, median, q75, max_length = np.percentile(lengths, [0, 25, 50, 75, 100])
                     length_comparison['length_statistics'][dataset_name] = {
                         'count': len(lengths),
                         'mean': lengths.mean(),
-                        'median': lengths.median(),
-                        'std': lengths.std(),
-                        'min': lengths.min(),
-                        'max': lengths.max(),
-                        'q25': lengths.quantile(0.25),
-                        'q75': lengths.quantile(0.75)
+                        'median': median,
+                        'std': lengths.std(ddof=1) if len(lengths) > 1 else np.nan,
+                        'min': min_length,
+                        'max': max_length,
+                        'q25': q25,
+                        'q75': q75
                     }
                     
                     length_comparison['length_distributions'][dataset_name] = lengths.tolist()
@@ -368,6 +413,8 @@ class ComparisonAnalyzer:
             self.logger.warning("No sequence length data available for plotting")
             return
         
+        import matplotlib.pyplot as plt
+        
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
         
         # Box plot
@@ -382,9 +429,11 @@ class ComparisonAnalyzer:
         ax1.set_ylabel('Sequence Length')
         ax1.tick_params(axis='x', rotation=45)
         
-        # Histogram
-        for dataset_name, lengths in length_comparison['length_distributions'].items():
-            ax2.hist(lengths, bins=30, alpha=0.7, label=dataset_name, edgecolor='black')
+        # Histogram on bin edges shared by every dataset so the bars line up
+        bin_edges = np.histogram_bin_edges(np.concatenate(length_data), bins=30)
+        for dataset_name, lengths in zip(labels, length_data):
+            counts, _ = np.histogram(lengths, bins=bin_edges)
+            ax2.hist(bin_edges[:-1], bins=bin_edges, weights=counts, alpha=0.7, label=dataset_name, edgecolor='black')
         
         ax2.set_title('Sequence Length Histogram')
         ax2.set_xlabel('Sequence Length')
@@ -3,16 +3,62 @@ Overlap analysis module for AlphaFold Core
 Handles analysis of protein overlaps between different datasets
 """
 
+import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional, Union
+from typing import Dict, List, Set, Tuple, Optional, Union, Any
 import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter
+from itertools import chain
+from functools import reduce, lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from ..config import config
-from ..utils import setup_logging, load_dataframe, save_dataframe
+from ..utils import setup_logging, load_dataframe, save_dataframe, safe_json_save
+
+
+# Below this many dataset pairs (30 datasets), process start-up costs more than the intersections
+PARALLEL_MIN_PAIRS = 435
+
+_worker_encoded = None
+
+
+@lru_cache(maxsize=None)
+def _merge_count_kernel():
+    """Numba-compiled two-pointer intersection count for sorted code arrays, or None without numba"""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    
+    @njit(cache=True, nogil=True)
+    def merge_count(a, b):
+        i = j = count = 0
+        while i < a.size and j < b.size:
+            if a[i] == b[j]:
+                count += 1
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return count
+    
+    return merge_count
+
+
+def _init_pair_worker(encoded: List):
+    """Keep the encoded datasets in a worker process for _pair_intersection_size"""
+    global _worker_encoded
+    _worker_encoded = encoded
+
+
+def _pair_intersection_size(i: int, j: int) -> int:
+    """Intersection size of one dataset pair, run inside a worker process"""
+    return OverlapAnalyzer._intersection_size(_worker_encoded[i], _worker_encoded[j])
 
 
 class OverlapAnalyzer:
@@ -36,22 +82,94 @@ class OverlapAnalyzer:
             'overlap_percentage_set2': len(intersection) / len(set2) * 100 if set2 else 0
         }
     
+    def _encode_datasets(self, datasets: Dict[str, Set]) -> Tuple[Dict[str, Any], pd.Index]:
+        """
+        Intern all IDs into one shared integer codebook and encode each dataset as a
+        bitmap of codes, or as a sorted code array when pyroaring is not installed.
+        """
+        id_sets = list(datasets.values())
+        lengths = [len(ids) for ids in id_sets]
+        all_ids = np.fromiter(chain.from_iterable(id_sets), dtype=object, count=sum(lengths))
+        # NA members get a real code like any other ID, never the -1 sentinel
+        codes, codebook = pd.factorize(all_ids, use_na_sentinel=False)
+        parts = np.split(codes.astype(np.int32), np.cumsum(lengths)[:-1]) if id_sets else []
+        
+        try:
+            from pyroaring import BitMap
+            encoded = {name: BitMap(part.tolist()) for name, part in zip(datasets, parts)}
+        except ImportError:
+            # Sorted unique code arrays support C-level merge intersections
+            encoded = {name: np.sort(part) for name, part in zip(datasets, parts)}
+        
+        return encoded, codebook
+    
+    @staticmethod
+    def _decode(encoded, codebook: pd.Index) -> Set:
+        """Map an encoded dataset back to the original IDs"""
+        if isinstance(encoded, np.ndarray):
+            return set(codebook[encoded])
+        return set(codebook[np.fromiter(encoded, dtype=np.int64, count=len(encoded))])
+    
+    @staticmethod
+    def _intersection_size(encoded1, encoded2) -> int:
+        """Size of the intersection of two encoded datasets"""
+        if isinstance(encoded1, np.ndarray):
+            # Both arrays are sorted and unique, so a merge count needs no output array
+            merge_count = _merge_count_kernel()
+            if merge_count is not None:
+                return int(merge_count(encoded1, encoded2))
+            return np.intersect1d(encoded1, encoded2, assume_unique=True).size
+        # Bitmap AND count in C, without building the intersection
+        return encoded1.intersection_cardinality(encoded2)
+    
+    def _pairwise_intersection_sizes(self, encoded: List, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """Intersection sizes for the (first[k], second[k]) pairs of encoded datasets"""
+        n_pairs = len(first)
+        if n_pairs < PARALLEL_MIN_PAIRS:
+            return np.fromiter((self._intersection_size(encoded[i], encoded[j]) for i, j in zip(first, second)),
+                               dtype=np.int64, count=n_pairs)
+        
+        # Pairs are independent; ship the encoded datasets to each worker once and
+        # send only index pairs, in a few chunks per worker
+        chunksize = max(1, n_pairs // (4 * (os.cpu_count() or 1)))
+        with ProcessPoolExecutor(initializer=_init_pair_worker, initargs=(encoded,)) as executor:
+            sizes = executor.map(_pair_intersection_size, first.tolist(), second.tolist(), chunksize=chunksize)
+            return np.fromiter(sizes, dtype=np.int64, count=n_pairs)
+    
     def analyze_multiple_datasets(self, datasets: Dict[str, Set], 
                                 dataset_names: Optional[List[str]] = None) -> pd.DataFrame:
         """Analyze overlaps between multiple datasets"""
         if dataset_names is None:
             dataset_names = list(datasets.keys())
         
-        results = []
+        encoded_by_name, _ = self._encode_datasets(datasets)
+        encoded = [encoded_by_name[name] for name in dataset_names]
+        
+        # Every i < j pair in row-major order, as parallel index arrays
+        first, second = np.triu_indices(len(dataset_names), k=1)
+        sizes = np.array([len(ids) for ids in encoded], dtype=np.int64)
+        intersection_size = self._pairwise_intersection_sizes(encoded, first, second)
+        
+        # Derive every remaining column with array arithmetic, 0 where the denominator is 0
+        set1_size = sizes[first]
+        set2_size = sizes[second]
+        union_size = set1_size + set2_size - intersection_size
         
-        for i, name1 in enumerate(dataset_names):
-            for j, name2 in enumerate(dataset_names[i+1:], i+1):
-                overlap_stats = self.calculate_overlap(datasets[name1], datasets[name2])
-                overlap_stats['dataset1'] = name1
-                overlap_stats['dataset2'] = name2
-                results.append(overlap_stats)
+        def ratio(numerator, denominator):
+            return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator != 0)
         
-        return pd.DataFrame(results)
+        names = np.array(dataset_names, dtype=object)
+        return pd.DataFrame({
+            'set1_size': set1_size,
+            'set2_size': set2_size,
+            'intersection_size': intersection_size,
+            'union_size': union_size,
+            'jaccard_similarity': ratio(intersection_size, union_size),
+            'overlap_percentage_set1': ratio(intersection_size, set1_size) * 100,
+            'overlap_percentage_set2': ratio(intersection_size, set2_size) * 100,
+            'dataset1': names[first],
+            'dataset2': names[second]
+        })
     
     def analyze_from_dataframes(self, dataframes: Dict[str, pd.DataFrame], 
                               id_columns: Dict[str, str]) -> pd.DataFrame:
@@ -61,7 +179,9 @@ class OverlapAnalyzer:
         for name, df in dataframes.items():
             id_col = id_columns.get(name, 'protein_id')
             if id_col in df.columns:
-                datasets[name] = set(df[id_col].dropna().unique())
+                # The categories are the distinct non-null IDs (free if the column is
+                # already categorical); the encoder takes them as-is, no Python set needed
+                datasets[name] = df[id_col].astype('category').cat.categories.to_numpy()
             else:
                 self.logger.warning(f"Column {id_col} not found in dataset {name}")
         
@@ -72,8 +192,11 @@ class OverlapAnalyzer:
         """Analyze overlaps from multiple files"""
         dataframes = {}
         
-        for name, file_path in file_paths.items():
-            df = load_dataframe(file_path)
+        # Loading is I/O bound; read every file concurrently so disk latency overlaps
+        with ThreadPoolExecutor(max_workers=max(1, len(file_paths))) as executor:
+            loaded = list(executor.map(load_dataframe, file_paths.values()))
+        
+        for (name, file_path), df in zip(file_paths.items(), loaded):
             if df is not None:
                 dataframes[name] = df
             else:
@@ -84,36 +207,51 @@ class OverlapAnalyzer:
     def create_overlap_matrix(self, datasets: Dict[str, Set]) -> pd.DataFrame:
         """Create a matrix showing overlap percentages between all datasets"""
         dataset_names = list(datasets.keys())
-        matrix = pd.DataFrame(index=dataset_names, columns=dataset_names)
+        encoded_by_name, _ = self._encode_datasets(datasets)
+        encoded = list(encoded_by_name.values())
+        sizes = np.array([len(ids) for ids in encoded], dtype=np.int64)
         
-        for i, name1 in enumerate(dataset_names):
-            for j, name2 in enumerate(dataset_names):
-                if i == j:
-                    matrix.loc[name1, name2] = 100.0  # Self-overlap
-                else:
-                    overlap_stats = self.calculate_overlap(datasets[name1], datasets[name2])
-                    matrix.loc[name1, name2] = overlap_stats['overlap_percentage_set1']
+        matrix = np.empty((len(dataset_names), len(dataset_names)), dtype=np.float64)
+        np.fill_diagonal(matrix, 100.0)  # Self-overlap
         
-        return matrix
+        # Each intersection fills both cells of its pair, as a share of either dataset
+        first, second = np.triu_indices(len(dataset_names), k=1)
+        intersection_size = self._pairwise_intersection_sizes(encoded, first, second)
+        for rows, cols in ((first, second), (second, first)):
+            matrix[rows, cols] = np.divide(intersection_size, sizes[rows], out=np.zeros(len(rows)),
+                                           where=sizes[rows] != 0) * 100
+        
+        return pd.DataFrame(matrix, index=dataset_names, columns=dataset_names)
     
     def find_unique_proteins(self, datasets: Dict[str, Set], 
                            dataset_name: str) -> Set:
         """Find proteins unique to a specific dataset"""
         target_set = datasets[dataset_name]
-        other_sets = [datasets[name] for name in datasets if name != dataset_name]
+        other_names = [name for name in datasets if name != dataset_name]
         
-        if not other_sets:
+        if not other_names:
             return target_set
         
-        other_union = set().union(*other_sets)
-        return target_set - other_union
+        encoded, codebook = self._encode_datasets(datasets)
+        other_encoded = [encoded[name] for name in other_names]
+        if isinstance(encoded[dataset_name], np.ndarray):
+            unique = np.setdiff1d(encoded[dataset_name], np.concatenate(other_encoded))
+        else:
+            unique = encoded[dataset_name] - other_encoded[0].union(*other_encoded[1:])
+        return self._decode(unique, codebook)
     
     def find_common_proteins(self, datasets: Dict[str, Set]) -> Set:
         """Find proteins common to all datasets"""
         if not datasets:
             return set()
         
-        return set.intersection(*datasets.values())
+        encoded, codebook = self._encode_datasets(datasets)
+        encoded_sets = list(encoded.values())
+        if isinstance(encoded_sets[0], np.ndarray):
+            common = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), encoded_sets)
+        else:
+            common = encoded_sets[0].intersection(*encoded_sets[1:])
+        return self._decode(common, codebook)
     
     def save_overlap_results(self, overlap_df: pd.DataFrame, 
                            output_prefix: str = "overlap_analysis") -> Dict[str, str]:
@@ -135,9 +273,7 @@ class OverlapAnalyzer:
         }
         
         summary_file = f"{output_prefix}_summary.json"
-        import json
-        with open(summary_file, 'w') as f:
-            json.dump(summary_stats, f, indent=2)
+        safe_json_save(summary_stats, summary_file)
         output_files['summary_json'] = summary_file
         
         self.logger.info(f"Overlap analysis results saved to {csv_file} and {summary_file}")
@@ -189,6 +325,17 @@ class OverlapAnalyzer:
         except ImportError:
             self.logger.error("matplotlib_venn not installed. Install with: pip install matplotlib-venn")
     
+    @staticmethod
+    def _sequence_lengths(sequences: pd.Series) -> np.ndarray:
+        """Lengths of the non-null string values of a sequence column"""
+        if isinstance(sequences.dtype, pd.ArrowDtype):
+            # Arrow-backed strings: measure in Arrow's C++ kernel without boxing each value
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            return pc.utf8_length(pa.array(sequences.array)).drop_null().to_numpy().astype(np.int64)
+        
+        return np.fromiter((len(seq) for seq in sequences.to_numpy() if isinstance(seq, str)), dtype=np.int64)
+    
     def analyze_sequence_length_distribution(self, datasets: Dict[str, pd.DataFrame], 
                                           sequence_columns: Dict[str, str]) -> pd.DataFrame:
         """Analyze sequence length distributions across datasets"""
@@ -197,18 +344,26 @@ class OverlapAnalyzer:
         for dataset_name, df in datasets.items():
             seq_col = sequence_columns.get(dataset_name, 'sequence')
             if seq_col in df.columns:
-                lengths = df[seq_col].str.len().dropna()
+                lengths = self._sequence_lengths(df[seq_col])
+                
+                if len(lengths) > 0:
+                    # All order statistics from one percentile call
+                    min_length, q25, median, q75, max_length = np.percentile(lengths, [0, 25, 50, 75, 100])
+                    mean_length = lengths.mean()
+                    std_length = lengths.std(ddof=1) if len(lengths) > 1 else np.nan
+                else:
+                    min_length = q25 = median = q75 = max_length = mean_length = std_length = np.nan
                 
                 stats = {
                     'dataset': dataset_name,
                     'count': len(lengths),
-                    'mean_length': lengths.mean(),
-                    'median_length': lengths.median(),
-                    'std_length': lengths.std(),
-                    'min_length': lengths.min(),
-                    'max_length': lengths.max(),
-                    'q25': lengths.quantile(0.25),
-                    'q75': lengths.quantile(0.75)
+                    'mean_length': mean_length,
+                    'median_length': median,
+                    'std_length': std_length,
+                    'min_length': min_length,
+                    'max_length': max_length,
+                    'q25': q25,
+                    'q75': q75
                 }
                 length_stats.append(stats)
         
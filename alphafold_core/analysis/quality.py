@@ -25,8 +25,37 @@ class QualityAnalyzer:
             'ranking_score': 0.8
         }
     
+    def _numeric_columns(self, metrics_df: pd.DataFrame) -> pd.Index:
+        """Numeric columns of metrics_df; callers running several analyses can compute it once and pass it on"""
+        return metrics_df.select_dtypes(include=[np.number]).columns
+    
+    def _threshold_matrix(self, metrics_df: pd.DataFrame,
+                          thresholds: Dict[str, float]) -> Tuple[List[str], np.ndarray]:
+        """Return the thresholded metrics present in metrics_df and an (N, k) pass/fail matrix"""
+        metrics = [metric for metric in thresholds if metric in metrics_df.columns]
+        if not metrics:
+            return metrics, np.empty((len(metrics_df), 0), dtype=bool)
+        
+        values = metrics_df[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+        threshold_values = np.array([thresholds[metric] for metric in metrics], dtype=np.float64)
+        # Broadcast each column against its own threshold; NaN never passes
+        return metrics, values >= threshold_values
+    
+    def _correlations(self, metrics_df: pd.DataFrame, columns: pd.Index) -> Dict[str, Any]:
+        """Pearson correlations between columns, as {'columns': [...], 'matrix': (k, k) ndarray}"""
+        values = metrics_df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if np.isnan(values).any():
+            # Pairwise-complete handling of missing values needs pandas
+            matrix = metrics_df[columns].corr().to_numpy()
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                matrix = np.corrcoef(values, rowvar=False)
+        return {'columns': list(columns), 'matrix': matrix}
+    
     def assess_prediction_quality(self, metrics_df: pd.DataFrame,
-                                thresholds: Dict[str, float] = None) -> Dict[str, Any]:
+                                thresholds: Dict[str, float] = None,
+                                include_correlations: bool = False,
+                                numeric_columns: Optional[pd.Index] = None) -> Dict[str, Any]:
         """Assess the quality of AlphaFold predictions"""
         if thresholds is None:
             thresholds = self.default_thresholds
@@ -38,28 +67,28 @@ class QualityAnalyzer:
             'summary_stats': {}
         }
         
-        # Calculate quality breakdown
-        for metric, threshold in thresholds.items():
-            if metric in metrics_df.columns:
-                high_quality = metrics_df[metric] >= threshold
+        # Compare every thresholded metric once; both the per-metric breakdown and
+        # the overall score are read off this (N, k) matrix
+        metrics, hq_mat = self._threshold_matrix(metrics_df, thresholds)
+        hq_counts = hq_mat.sum(axis=0)
+        
+        # Calculate quality breakdown; descriptive stats for every metric in one agg call
+        if metrics:
+            stats = metrics_df[metrics].agg(['mean', 'median', 'std']).to_numpy()
+            for metric, high_quality_count, (mean, median, std) in zip(metrics, hq_counts, stats.T):
                 assessment['quality_breakdown'][metric] = {
-                    'high_quality_count': high_quality.sum(),
-                    'high_quality_percentage': (high_quality.sum() / len(metrics_df)) * 100,
-                    'threshold': threshold,
-                    'mean_value': metrics_df[metric].mean(),
-                    'median_value': metrics_df[metric].median(),
-                    'std_value': metrics_df[metric].std()
+                    'high_quality_count': high_quality_count,
+                    'high_quality_percentage': (high_quality_count / len(metrics_df)) * 100,
+                    'threshold': thresholds[metric],
+                    'mean_value': mean,
+                    'median_value': median,
+                    'std_value': std
                 }
         
         # Calculate overall quality score
-        quality_scores = []
-        for metric, threshold in thresholds.items():
-            if metric in metrics_df.columns:
-                score = (metrics_df[metric] >= threshold).astype(int)
-                quality_scores.append(score)
-        
-        if quality_scores:
-            overall_quality = pd.concat(quality_scores, axis=1).mean(axis=1)
+        if metrics:
+            # Fraction of thresholds met per prediction
+            overall_quality = hq_mat.mean(axis=1)
             assessment['overall_quality'] = {
                 'mean_score': overall_quality.mean(),
                 'high_quality_count': (overall_quality >= 0.5).sum(),
@@ -67,13 +96,102 @@ class QualityAnalyzer:
             }
         
         # Summary statistics
-        numeric_columns = metrics_df.select_dtypes(include=[np.number]).columns
+        if numeric_columns is None:
+            numeric_columns = self._numeric_columns(metrics_df)
         assessment['summary_stats'] = {
             'numeric_columns': list(numeric_columns),
             'missing_values': metrics_df.isnull().sum().to_dict(),
-            'correlations': metrics_df[numeric_columns].corr().to_dict() if len(numeric_columns) > 1 else {}
+            'correlations': {}
+        }
+        
+        # The correlation matrix is O(N * k^2), so only build it on request
+        if include_correlations and len(numeric_columns) > 1:
+            assessment['summary_stats']['correlations'] = self._correlations(metrics_df, numeric_columns)
+        
+        return assessment
+    
+    def assess_prediction_quality_streaming(self, file_path: Union[str, Path],
+                                          thresholds: Dict[str, float] = None,
+                                          chunksize: int = 1_000_000) -> Dict[str, Any]:
+        """
+        Assess prediction quality from a metrics CSV without loading it whole.
+        
+        Per-chunk counts, means and squared-deviation sums are merged chunk by chunk,
+        so memory stays O(chunksize). Medians need the full column and are not reported.
+        """
+        if thresholds is None:
+            thresholds = self.default_thresholds
+        
+        total = 0
+        metrics = None
+        counts = means = m2 = high_quality = None
+        overall_sum = 0.0
+        overall_high_quality = 0
+        
+        # Only the thresholded metric columns are parsed
+        for chunk in pd.read_csv(file_path, usecols=lambda column: column in thresholds, chunksize=chunksize):
+            if metrics is None:
+                metrics = [metric for metric in thresholds if metric in chunk.columns]
+                counts = np.zeros(len(metrics), dtype=np.int64)
+                high_quality = np.zeros(len(metrics), dtype=np.int64)
+                means = np.zeros(len(metrics))
+                m2 = np.zeros(len(metrics))
+            
+            total += len(chunk)
+            if not metrics:
+                continue
+            
+            _, passed = self._threshold_matrix(chunk, thresholds)
+            values = chunk[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+            present = ~np.isnan(values)
+            # Merge this chunk's (count, mean, M2) into the running totals with Chan et al.'s
+            # pairwise update; summing raw squares would cancel catastrophically for
+            # tightly clustered scores such as pLDDT or ipTM
+            chunk_counts = present.sum(axis=0)
+            chunk_means = np.divide(np.nansum(values, axis=0), chunk_counts,
+                                    out=np.zeros(len(metrics)), where=chunk_counts > 0)
+            deviations = np.where(present, values - chunk_means, 0.0)
+            chunk_m2 = (deviations * deviations).sum(axis=0)
+            
+            merged_counts = counts + chunk_counts
+            delta = chunk_means - means
+            weight = np.divide(chunk_counts, merged_counts,
+                               out=np.zeros(len(metrics)), where=merged_counts > 0)
+            means += delta * weight
+            m2 += chunk_m2 + delta * delta * counts * weight
+            counts = merged_counts
+            high_quality += passed.sum(axis=0)
+            
+            overall = passed.mean(axis=1)
+            overall_sum += overall.sum()
+            overall_high_quality += int((overall >= 0.5).sum())
+        
+        assessment = {
+            'total_predictions': total,
+            'quality_breakdown': {},
+            'thresholds_used': thresholds
         }
+        if not metrics:
+            return assessment
+        
+        means = np.where(counts > 0, means, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stds = np.where(counts > 1, np.sqrt(m2 / (counts - 1)), np.nan)
+        
+        for k, metric in enumerate(metrics):
+            assessment['quality_breakdown'][metric] = {
+                'high_quality_count': int(high_quality[k]),
+                'high_quality_percentage': (high_quality[k] / total) * 100 if total else 0,
+                'threshold': thresholds[metric],
+                'mean_value': means[k],
+                'std_value': stds[k]
+            }
         
+        assessment['overall_quality'] = {
+            'mean_score': overall_sum / total if total else np.nan,
+            'high_quality_count': overall_high_quality,
+            'high_quality_percentage': (overall_high_quality / total) * 100 if total else 0
+        }
         return assessment
     
     def filter_high_quality_predictions(self, metrics_df: pd.DataFrame,
@@ -83,33 +201,39 @@ class QualityAnalyzer:
         if thresholds is None:
             thresholds = self.default_thresholds
         
-        filtered_df = metrics_df.copy()
+        # No upfront copy: each filter below selects rows into a new frame and
+        # never writes to metrics_df; the pass-through case gets a shallow copy
+        filtered_df = metrics_df
         
         if filter_type == 'all':
-            # All thresholds must be met
-            for metric, threshold in thresholds.items():
-                if metric in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df[metric] >= threshold]
+            # All thresholds must be met; one fused mask over every metric, one gather
+            metrics, passed = self._threshold_matrix(filtered_df, thresholds)
+            if metrics:
+                filtered_df = filtered_df.iloc[passed.all(axis=1)]
         
         elif filter_type == 'any':
             # At least one threshold must be met
-            mask = pd.Series([False] * len(filtered_df), index=filtered_df.index)
+            mask = np.zeros(len(filtered_df), dtype=bool)
             for metric, threshold in thresholds.items():
                 if metric in filtered_df.columns:
-                    mask |= filtered_df[metric] >= threshold
-            filtered_df = filtered_df[mask]
+                    mask |= filtered_df[metric].to_numpy(dtype=np.float64, na_value=np.nan) >= threshold
+            filtered_df = filtered_df.iloc[mask]
         
         elif filter_type == 'majority':
             # Majority of thresholds must be met
             quality_scores = []
             for metric, threshold in thresholds.items():
                 if metric in filtered_df.columns:
-                    score = (filtered_df[metric] >= threshold).astype(int)
+                    score = filtered_df[metric].to_numpy(dtype=np.float64, na_value=np.nan) >= threshold
                     quality_scores.append(score)
             
             if quality_scores:
-                overall_quality = pd.concat(quality_scores, axis=1).mean(axis=1)
-                filtered_df = filtered_df[overall_quality >= 0.5]
+                overall_quality = np.stack(quality_scores).mean(axis=0)
+                filtered_df = filtered_df.iloc[overall_quality >= 0.5]
+        
+        if filtered_df is metrics_df:
+            # No filter applied; still hand back a new frame so callers never alias the input
+            filtered_df = metrics_df.copy(deep=False)
         
         self.logger.info(f"Filtered from {len(metrics_df)} to {len(filtered_df)} predictions")
         return filtered_df
@@ -122,34 +246,36 @@ class QualityAnalyzer:
             columns = ['iptm', 'ptm', 'ranking_score']
         
         outliers = {}
+        present = [column for column in columns if column in metrics_df.columns]
+        if not present or method not in ('iqr', 'zscore'):
+            return outliers
         
-        for column in columns:
-            if column not in metrics_df.columns:
-                continue
-            
-            data = metrics_df[column].dropna()
-            
+        # Quartiles / moments for every column in one call each; NaN cells are
+        # ignored by the nan-aware reductions and never compare as outliers
+        values = metrics_df[present].to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
             if method == 'iqr':
-                Q1 = data.quantile(0.25)
-                Q3 = data.quantile(0.75)
+                Q1, Q3 = np.nanpercentile(values, [25, 75], axis=0)
                 IQR = Q3 - Q1
                 lower_bound = Q1 - 1.5 * IQR
                 upper_bound = Q3 + 1.5 * IQR
-                
-                outlier_indices = data[(data < lower_bound) | (data > upper_bound)].index
-                outliers[column] = outlier_indices.tolist()
+                outlier_mask = (values < lower_bound) | (values > upper_bound)
             
-            elif method == 'zscore':
-                z_scores = np.abs((data - data.mean()) / data.std())
-                outlier_indices = data[z_scores > 3].index
-                outliers[column] = outlier_indices.tolist()
+            else:
+                z_scores = np.abs((values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0, ddof=1))
+                outlier_mask = z_scores > 3
+        
+        for j, column in enumerate(present):
+            outliers[column] = metrics_df.index[outlier_mask[:, j]].tolist()
         
         return outliers
     
     def generate_quality_report(self, metrics_df: pd.DataFrame,
-                              output_file: str = "quality_report.txt") -> str:
+                              output_file: str = "quality_report.txt",
+                              numeric_columns: Optional[pd.Index] = None) -> str:
         """Generate a comprehensive quality report"""
-        assessment = self.assess_prediction_quality(metrics_df)
+        assessment = self.assess_prediction_quality(metrics_df, numeric_columns=numeric_columns)
         
         report = []
         report.append("AlphaFold Quality Assessment Report")
@@ -195,9 +321,11 @@ class QualityAnalyzer:
     
     def plot_quality_distributions(self, metrics_df: pd.DataFrame,
                                  output_file: str = "quality_distributions.png",
-                                 figsize: Tuple[int, int] = (15, 10)):
+                                 figsize: Tuple[int, int] = (15, 10),
+                                 numeric_columns: Optional[pd.Index] = None):
         """Create quality distribution plots"""
-        numeric_columns = metrics_df.select_dtypes(include=[np.number]).columns
+        if numeric_columns is None:
+            numeric_columns = self._numeric_columns(metrics_df)
         
         if len(numeric_columns) == 0:
             self.logger.warning("No numeric columns found for plotting")
@@ -212,10 +340,14 @@ class QualityAnalyzer:
             
             ax = axes[i]
             
-            # Histogram
-            ax.hist(metrics_df[column].dropna(), bins=30, alpha=0.7, edgecolor='black')
-            ax.axvline(metrics_df[column].mean(), color='red', linestyle='--', label='Mean')
-            ax.axvline(metrics_df[column].median(), color='green', linestyle='--', label='Median')
+            # Histogram, binned once in NumPy and drawn as bars
+            values = metrics_df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            counts, edges = np.histogram(values, bins=30)
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.7, edgecolor='black')
+            if values.size:
+                ax.axvline(values.mean(), color='red', linestyle='--', label='Mean')
+                ax.axvline(np.median(values), color='green', linestyle='--', label='Median')
             
             # Add threshold line if it exists
             if column in self.default_thresholds:
@@ -239,9 +371,11 @@ class QualityAnalyzer:
     
     def plot_quality_correlations(self, metrics_df: pd.DataFrame,
                                 output_file: str = "quality_correlations.png",
-                                figsize: Tuple[int, int] = (10, 8)):
+                                figsize: Tuple[int, int] = (10, 8),
+                                numeric_columns: Optional[pd.Index] = None):
         """Create correlation heatmap of quality metrics"""
-        numeric_columns = metrics_df.select_dtypes(include=[np.number]).columns
+        if numeric_columns is None:
+            numeric_columns = self._numeric_columns(metrics_df)
         
         if len(numeric_columns) < 2:
             self.logger.warning("Need at least 2 numeric columns for correlation plot")
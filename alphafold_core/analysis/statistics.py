@@ -3,16 +3,49 @@ Statistical analysis module for AlphaFold Core
 Handles statistical analysis of AlphaFold predictions and data
 """
 
+import io
 import pandas as pd
 import numpy as np
+import warnings
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple, Any
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
+from concurrent.futures import ProcessPoolExecutor
 
 from ..config import config
 from ..utils import setup_logging
+from ._stats_kernels import col_moments
+
+
+# Below this many columns pandas' single-threaded corr beats process start-up
+PARALLEL_MIN_CORR_COLUMNS = 100
+
+# Column pairs handed to a worker per task
+CORR_CHUNK_PAIRS = 500
+
+_worker_matrix = None
+
+
+def _init_corr_worker(matrix: np.ndarray):
+    """Keep the data matrix in a worker process for _pair_correlations"""
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def _pair_correlations(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Pearson r over pairwise-complete rows for each (first[k], second[k]) column pair"""
+    result = np.empty(len(first))
+    for k, (i, j) in enumerate(zip(first, second)):
+        x = _worker_matrix[:, i]
+        y = _worker_matrix[:, j]
+        both = ~(np.isnan(x) | np.isnan(y))
+        if both.sum() < 2:
+            result[k] = np.nan
+            continue
+        dx = x[both] - x[both].mean()
+        dy = y[both] - y[both].mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[k] = np.dot(dx, dy) / np.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+    return np.clip(result, -1.0, 1.0)
 
 
 class StatisticalAnalyzer:
@@ -20,28 +53,129 @@ class StatisticalAnalyzer:
     
     def __init__(self):
         self.logger = setup_logging()
+        self._summary_fig = None
+    
+    def numeric_view(self, df: pd.DataFrame,
+                     columns: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Numeric column names of df (or the given columns) and their values as one
+        column-major float64 matrix.
+        
+        Callers running several analyses on one frame can build this once and pass it
+        to each method as numeric_view; it is not cached, so it reflects df as of the call.
+        """
+        if columns is None:
+            columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        else:
+            columns = [column for column in columns if column in df.columns]
+        # Column-major so every per-column reduction reads contiguous memory
+        X = np.asfortranarray(df[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        return columns, X
+    
+    @staticmethod
+    def _order_statistics(values: np.ndarray, quantiles: List[float]) -> Tuple[float, float, np.ndarray]:
+        """Min, max and linearly interpolated quantiles of a NaN-free array from one partition"""
+        n = values.size
+        positions = np.asarray(quantiles, dtype=np.float64) * (n - 1)
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.ceil(positions).astype(np.intp)
+        
+        # A single introselect places every needed rank; no full sort per quantile
+        kth = np.unique(np.concatenate(([0, n - 1], lower, upper)))
+        partitioned = np.partition(values, kth)
+        low_values = partitioned[lower]
+        quantile_values = low_values + (partitioned[upper] - low_values) * (positions - lower)
+        return partitioned[0], partitioned[n - 1], quantile_values
+    
+    @staticmethod
+    def _moment_statistics(n, m2, m3, m4) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sample std, skewness and excess kurtosis from counts and central moments, as pandas computes them"""
+        n = np.asarray(n, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.where(n > 1, np.sqrt(m2 * n / (n - 1)), np.nan)
+            # Bias-corrected estimators; a constant series has 0 skewness and kurtosis
+            skewness = np.where(n < 3, np.nan,
+                                np.where(m2 == 0, 0.0, np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5))
+            kurtosis = np.where(n < 4, np.nan,
+                                np.where(m2 == 0, 0.0, (n - 1) / ((n - 2) * (n - 3))
+                                         * ((n + 1) * m4 / (m2 * m2) - 3 * (n - 1))))
+        return std, skewness, kurtosis
     
     def calculate_descriptive_statistics(self, data: pd.Series) -> Dict[str, float]:
         """Calculate descriptive statistics for a data series"""
+        values = data.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        n = values.size
+        
+        if n == 0:
+            return {'count': 0, 'mean': np.nan, 'median': np.nan, 'std': np.nan, 'min': np.nan,
+                    'max': np.nan, 'q25': np.nan, 'q75': np.nan, 'skewness': np.nan, 'kurtosis': np.nan}
+        
+        # Central moments from one deviation array
+        mean = values.mean()
+        deviations = values - mean
+        squared = deviations * deviations
+        m2 = squared.mean()
+        m3 = (squared * deviations).mean()
+        m4 = (squared * squared).mean()
+        std, skewness, kurtosis = (moment.item() for moment in self._moment_statistics(n, m2, m3, m4))
+        
+        min_value, max_value, (q25, median, q75) = self._order_statistics(values, [0.25, 0.5, 0.75])
+        
         stats_dict = {
-            'count': len(data.dropna()),
-            'mean': data.mean(),
-            'median': data.median(),
-            'std': data.std(),
-            'min': data.min(),
-            'max': data.max(),
-            'q25': data.quantile(0.25),
-            'q75': data.quantile(0.75),
-            'skewness': data.skew(),
-            'kurtosis': data.kurtosis()
+            'count': n,
+            'mean': mean,
+            'median': median,
+            'std': std,
+            'min': min_value,
+            'max': max_value,
+            'q25': q25,
+            'q75': q75,
+            'skewness': skewness,
+            'kurtosis': kurtosis
         }
         return stats_dict
     
+    def _parallel_corr(self, X: np.ndarray, columns: List[str], n_jobs: int = -1,
+                       chunks: int = CORR_CHUNK_PAIRS) -> pd.DataFrame:
+        """Pairwise-complete Pearson correlation matrix, with column pairs split across processes"""
+        if not np.isnan(X).any():
+            # Without missing values every pair uses all rows; one BLAS-backed call
+            with np.errstate(divide='ignore', invalid='ignore'):
+                matrix = np.clip(np.corrcoef(X, rowvar=False), -1.0, 1.0)
+            return pd.DataFrame(matrix, index=columns, columns=columns)
+        
+        # Upper triangle including the diagonal (NaN for constant columns, as in pandas)
+        first, second = np.triu_indices(X.shape[1])
+        n_chunks = max(1, -(-len(first) // chunks))
+        max_workers = None if n_jobs is None or n_jobs < 0 else n_jobs
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_corr_worker,
+                                 initargs=(X,)) as executor:
+            values = np.concatenate(list(executor.map(_pair_correlations, np.array_split(first, n_chunks),
+                                                      np.array_split(second, n_chunks))))
+        
+        matrix = np.empty((X.shape[1], X.shape[1]))
+        matrix[first, second] = values
+        matrix[second, first] = values
+        return pd.DataFrame(matrix, index=columns, columns=columns)
+    
+    def _correlation_matrix(self, X: np.ndarray, columns: List[str], n_jobs: int = -1) -> pd.DataFrame:
+        """Pearson correlation matrix of the columns of X"""
+        # Wide matrices spread the O(K^2 N) pair loop over n_jobs processes (-1: all cores)
+        if n_jobs != 1 and len(columns) >= PARALLEL_MIN_CORR_COLUMNS:
+            return self._parallel_corr(X, columns, n_jobs)
+        return pd.DataFrame(X, columns=columns, copy=False).corr()
+    
     def analyze_dataframe_statistics(self, df: pd.DataFrame,
-                                   numeric_columns: List[str] = None) -> Dict[str, Any]:
+                                   numeric_columns: List[str] = None,
+                                   n_jobs: int = -1,
+                                   numeric_view: Optional[Tuple[List[str], np.ndarray]] = None) -> Dict[str, Any]:
         """Analyze statistics for all numeric columns in a dataframe"""
+        if numeric_view is None:
+            numeric_view = self.numeric_view(df, numeric_columns)
+        present, X = numeric_view
         if numeric_columns is None:
-            numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+            numeric_columns = present
         
         analysis = {
             'columns': numeric_columns,
@@ -50,22 +184,51 @@ class StatisticalAnalyzer:
             'missing_data': {}
         }
         
-        # Calculate statistics for each column
-        for column in numeric_columns:
-            if column in df.columns:
-                analysis['statistics'][column] = self.calculate_descriptive_statistics(df[column])
-                analysis['missing_data'][column] = df[column].isna().sum()
+        # Calculate statistics for every column from one float64 matrix: moments in a
+        # single sweep per column, quartiles in one NumPy call
+        if present:
+            count, mean, m2, m3, m4, minimum, maximum = col_moments(X)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                m2, m3, m4 = m2 / count, m3 / count, m4 / count
+            std, skewness, kurtosis = self._moment_statistics(count, m2, m3, m4)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns
+                q25, median, q75 = np.nanquantile(X, [0.25, 0.5, 0.75], axis=0)
+            
+            stat_values = {
+                'count': count.tolist(), 'mean': mean.tolist(), 'median': median.tolist(),
+                'std': std.tolist(), 'min': minimum.tolist(), 'max': maximum.tolist(),
+                'q25': q25.tolist(), 'q75': q75.tolist(),
+                'skewness': skewness.tolist(), 'kurtosis': kurtosis.tolist()
+            }
+            for j, column in enumerate(present):
+                analysis['statistics'][column] = {name: values[j] for name, values in stat_values.items()}
+            
+            # The moment sweep already counted the non-NaN values of every column
+            analysis['missing_data'] = dict(zip(present, (X.shape[0] - count).tolist()))
         
         # Calculate correlations
-        if len(numeric_columns) > 1:
-            correlation_matrix = df[numeric_columns].corr()
-            analysis['correlations'] = correlation_matrix.to_dict()
+        if len(present) > 1:
+            # Kept as a (K, K) array; correlations_as_dict gives the nested-dict form
+            correlation_matrix = self._correlation_matrix(X, present, n_jobs)
+            analysis['correlations'] = {'columns': present, 'matrix': correlation_matrix.to_numpy()}
         
         return analysis
     
+    @staticmethod
+    def correlations_as_dict(correlations: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """Expand {'columns', 'matrix'} correlations into the nested {column: {column: r}} dict"""
+        if not correlations:
+            return {}
+        columns = correlations['columns']
+        rows = correlations['matrix'].tolist()
+        return {column: dict(zip(columns, row)) for column, row in zip(columns, rows)}
+    
     def perform_hypothesis_test(self, data1: pd.Series, data2: pd.Series,
                               test_type: str = 't_test') -> Dict[str, Any]:
         """Perform hypothesis testing between two datasets"""
+        from scipy import stats
+        
         # Remove NaN values
         data1_clean = data1.dropna()
         data2_clean = data2.dropna()
@@ -112,6 +275,8 @@ class StatisticalAnalyzer:
     def analyze_distribution_fit(self, data: pd.Series,
                                distributions: List[str] = None) -> Dict[str, Any]:
         """Analyze how well data fits different distributions"""
+        from scipy import stats
+        
         if distributions is None:
             distributions = ['normal', 'lognormal', 'exponential', 'gamma']
         
@@ -124,22 +289,30 @@ class StatisticalAnalyzer:
             'distribution_fits': {}
         }
         
+        # Sort once and share the empirical CDF steps across every candidate fit;
+        # each fit then only costs its vectorized cdf evaluation
+        sorted_data = np.sort(data_clean.to_numpy(dtype=np.float64))
+        n = sorted_data.size
+        ecdf_upper = np.arange(1, n + 1) / n
+        ecdf_lower = np.arange(0, n) / n
+        candidates = {
+            'normal': stats.norm,
+            'lognormal': stats.lognorm,
+            'exponential': stats.expon,
+            'gamma': stats.gamma
+        }
+        
         for dist_name in distributions:
+            if dist_name not in candidates:
+                continue
+            distribution = candidates[dist_name]
             try:
-                if dist_name == 'normal':
-                    params = stats.norm.fit(data_clean)
-                    ks_stat, p_value = stats.kstest(data_clean, 'norm', params)
-                elif dist_name == 'lognormal':
-                    params = stats.lognorm.fit(data_clean)
-                    ks_stat, p_value = stats.kstest(data_clean, 'lognorm', params)
-                elif dist_name == 'exponential':
-                    params = stats.expon.fit(data_clean)
-                    ks_stat, p_value = stats.kstest(data_clean, 'expon', params)
-                elif dist_name == 'gamma':
-                    params = stats.gamma.fit(data_clean)
-                    ks_stat, p_value = stats.kstest(data_clean, 'gamma', params)
-                else:
-                    continue
+                params = distribution.fit(sorted_data)
+                
+                # Two-sided KS statistic and p-value, as stats.kstest computes them
+                cdf = distribution.cdf(sorted_data, *params)
+                ks_stat = max((ecdf_upper - cdf).max(), (cdf - ecdf_lower).max())
+                p_value = stats.kstwo.sf(ks_stat, n)
                 
                 results['distribution_fits'][dist_name] = {
                     'parameters': params,
@@ -156,6 +329,8 @@ class StatisticalAnalyzer:
     def calculate_confidence_intervals(self, data: pd.Series,
                                      confidence_level: float = 0.95) -> Dict[str, float]:
         """Calculate confidence intervals for the mean"""
+        from scipy import stats
+        
         data_clean = data.dropna()
         
         if len(data_clean) == 0:
@@ -177,132 +352,182 @@ class StatisticalAnalyzer:
             'sample_size': len(data_clean)
         }
     
-    def perform_anova(self, data_dict: Dict[str, pd.Series]) -> Dict[str, Any]:
-        """Perform one-way ANOVA on multiple groups"""
-        # Prepare data for ANOVA
-        groups = []
-        group_names = []
+    def _one_way_anova(self, codes: np.ndarray, values: np.ndarray, names: List[Any]) -> Dict[str, Any]:
+        """One-way ANOVA from integer group codes into names and NaN-free values"""
+        from scipy import stats
         
-        for name, data in data_dict.items():
-            clean_data = data.dropna()
-            if len(clean_data) > 0:
-                groups.append(clean_data)
-                group_names.append(name)
+        sizes = np.bincount(codes, minlength=len(names))
+        sums = np.bincount(codes, weights=values, minlength=len(names))
+        present = sizes > 0
         
-        if len(groups) < 2:
+        if present.sum() < 2:
             return {'error': 'Need at least 2 groups for ANOVA'}
         
-        # Perform ANOVA
-        f_stat, p_value = stats.f_oneway(*groups)
+        # Between/within sums of squares from per-group totals instead of per-group arrays
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / sizes
+            ss_between = (sizes[present] * (means[present] - values.mean()) ** 2).sum()
+            ss_within = ((values - means[codes]) ** 2).sum()
+            df_between = present.sum() - 1
+            df_within = values.size - present.sum()
+            f_stat = (ss_between / df_between) / (ss_within / df_within)
+        p_value = stats.f.sf(f_stat, df_between, df_within)
         
         results = {
             'f_statistic': f_stat,
             'p_value': p_value,
             'significant': p_value < 0.05,
-            'groups': group_names,
-            'group_sizes': [len(group) for group in groups],
-            'group_means': [group.mean() for group in groups]
+            'groups': [name for name, keep in zip(names, present) if keep],
+            'group_sizes': sizes[present].tolist(),
+            'group_means': means[present].tolist()
         }
         
         return results
     
+    def perform_anova(self, data_dict: Dict[str, pd.Series]) -> Dict[str, Any]:
+        """Perform one-way ANOVA on multiple groups"""
+        # Concatenate the groups into one value array tagged with group codes
+        names = list(data_dict)
+        arrays = [data.to_numpy(dtype=np.float64, na_value=np.nan) for data in data_dict.values()]
+        codes = np.repeat(np.arange(len(arrays)), [len(array) for array in arrays])
+        values = np.concatenate(arrays) if arrays else np.empty(0)
+        valid = ~np.isnan(values)
+        
+        return self._one_way_anova(codes[valid], values[valid], names)
+    
     def create_statistical_report(self, df: pd.DataFrame,
-                                output_file: str = "statistical_report.txt") -> str:
+                                output_file: str = "statistical_report.txt",
+                                numeric_view: Optional[Tuple[List[str], np.ndarray]] = None) -> str:
         """Generate a comprehensive statistical report"""
-        analysis = self.analyze_dataframe_statistics(df)
+        analysis = self.analyze_dataframe_statistics(df, numeric_view=numeric_view)
         
-        report = []
-        report.append("Statistical Analysis Report")
-        report.append("=" * 40)
-        report.append("")
+        report = io.StringIO()
+        report.write("Statistical Analysis Report\n"
+                     f"{'=' * 40}\n"
+                     "\n")
         
         # Overall statistics
-        report.append(f"Dataset Overview:")
-        report.append(f"  - Total rows: {len(df)}")
-        report.append(f"  - Numeric columns: {len(analysis['columns'])}")
-        report.append("")
+        report.write("Dataset Overview:\n"
+                     f"  - Total rows: {len(df)}\n"
+                     f"  - Numeric columns: {len(analysis['columns'])}\n"
+                     "\n")
         
-        # Statistics for each column
+        # Statistics for each column, one write per column block
         for column in analysis['columns']:
             if column in analysis['statistics']:
                 stats = analysis['statistics'][column]
-                report.append(f"{column.upper()} Statistics:")
-                report.append(f"  - Count: {stats['count']}")
-                report.append(f"  - Mean: {stats['mean']:.3f}")
-                report.append(f"  - Median: {stats['median']:.3f}")
-                report.append(f"  - Std: {stats['std']:.3f}")
-                report.append(f"  - Min: {stats['min']:.3f}")
-                report.append(f"  - Max: {stats['max']:.3f}")
-                report.append(f"  - Q25: {stats['q25']:.3f}")
-                report.append(f"  - Q75: {stats['q75']:.3f}")
-                report.append(f"  - Skewness: {stats['skewness']:.3f}")
-                report.append(f"  - Kurtosis: {stats['kurtosis']:.3f}")
-                report.append("")
+                report.write(f"{column.upper()} Statistics:\n"
+                             f"  - Count: {stats['count']}\n"
+                             f"  - Mean: {stats['mean']:.3f}\n"
+                             f"  - Median: {stats['median']:.3f}\n"
+                             f"  - Std: {stats['std']:.3f}\n"
+                             f"  - Min: {stats['min']:.3f}\n"
+                             f"  - Max: {stats['max']:.3f}\n"
+                             f"  - Q25: {stats['q25']:.3f}\n"
+                             f"  - Q75: {stats['q75']:.3f}\n"
+                             f"  - Skewness: {stats['skewness']:.3f}\n"
+                             f"  - Kurtosis: {stats['kurtosis']:.3f}\n"
+                             "\n")
         
         # Missing data summary
         if any(analysis['missing_data'].values()):
-            report.append("Missing Data Summary:")
+            report.write("Missing Data Summary:\n")
             for column, missing_count in analysis['missing_data'].items():
                 if missing_count > 0:
                     percentage = (missing_count / len(df)) * 100
-                    report.append(f"  - {column}: {missing_count} ({percentage:.1f}%)")
-            report.append("")
+                    report.write(f"  - {column}: {missing_count} ({percentage:.1f}%)\n")
+            report.write("\n")
+        
+        # Every line ends in a newline; drop the last one so the text matches the
+        # line-joined report
+        text = report.getvalue()[:-1]
         
         # Save report
         with open(output_file, 'w') as f:
-            f.write('\n'.join(report))
+            f.write(text)
         
         self.logger.info(f"Statistical report saved to {output_file}")
-        return '\n'.join(report)
+        return text
     
     def plot_statistical_summary(self, df: pd.DataFrame,
                                output_file: str = "statistical_summary.png",
-                               figsize: Tuple[int, int] = (15, 12)):
+                               figsize: Tuple[int, int] = (15, 12),
+                               dpi: int = 150,
+                               numeric_view: Optional[Tuple[List[str], np.ndarray]] = None):
         """Create comprehensive statistical summary plots"""
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
+        numeric_columns, X = numeric_view if numeric_view is not None else self.numeric_view(df)
         
         if len(numeric_columns) == 0:
             self.logger.warning("No numeric columns found for plotting")
             return
         
-        fig, axes = plt.subplots(2, 2, figsize=figsize)
-        axes = axes.flatten()
-        
-        # Box plots
-        df[numeric_columns].boxplot(ax=axes[0])
+        # One figure is cleared and redrawn across calls instead of allocating a
+        # new canvas per plot; it is not registered with pyplot, so needs no close
+        if self._summary_fig is None:
+            from matplotlib.figure import Figure
+            self._summary_fig = Figure()
+        fig = self._summary_fig
+        fig.clf()
+        fig.set_size_inches(figsize)
+        axes = fig.subplots(2, 2).flatten()
+        
+        # NaN-free values of each column, straight from the cached matrix
+        column_values = [X[:, j][~np.isnan(X[:, j])] for j in range(len(numeric_columns))]
+        
+        # Box plots; dense artists are rasterized so the PNG encoder sees pixels
+        boxplot_artists = axes[0].boxplot(column_values)
+        for artist in (artist for artists in boxplot_artists.values() for artist in artists):
+            artist.set_rasterized(True)
+        axes[0].set_xticks(range(1, len(numeric_columns) + 1), numeric_columns)
+        axes[0].grid(True)
         axes[0].set_title('Box Plots of Numeric Variables')
         axes[0].tick_params(axis='x', rotation=45)
         
-        # Histograms
+        # Histograms, binned in NumPy and drawn as bars
         for i, column in enumerate(numeric_columns[:4]):
             if i < len(axes) - 1:
-                axes[i + 1].hist(df[column].dropna(), bins=30, alpha=0.7, edgecolor='black')
+                counts, edges = np.histogram(column_values[i], bins=30)
+                axes[i + 1].bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                                alpha=0.7, edgecolor='black', rasterized=True)
                 axes[i + 1].set_title(f'{column} Distribution')
                 axes[i + 1].set_xlabel(column)
                 axes[i + 1].set_ylabel('Frequency')
         
-        plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
         
         self.logger.info(f"Statistical summary plot saved to {output_file}")
     
     def plot_correlation_matrix(self, df: pd.DataFrame,
                               output_file: str = "correlation_matrix.png",
-                              figsize: Tuple[int, int] = (10, 8)):
+                              figsize: Tuple[int, int] = (10, 8),
+                              annotate_min: float = 0.3,
+                              numeric_view: Optional[Tuple[List[str], np.ndarray]] = None):
         """Create correlation matrix heatmap"""
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
+        import matplotlib.pyplot as plt
+        
+        numeric_columns, X = numeric_view if numeric_view is not None else self.numeric_view(df)
         
         if len(numeric_columns) < 2:
             self.logger.warning("Need at least 2 numeric columns for correlation matrix")
             return
         
-        correlation_matrix = df[numeric_columns].corr()
+        correlation_matrix = self._correlation_matrix(X, numeric_columns).to_numpy()
+        
+        fig, ax = plt.subplots(figsize=figsize)
+        im = ax.imshow(correlation_matrix, cmap='coolwarm', vmin=-1, vmax=1, interpolation='nearest')
+        fig.colorbar(im, ax=ax)
+        ax.set_xticks(range(len(numeric_columns)), numeric_columns, rotation=90)
+        ax.set_yticks(range(len(numeric_columns)), numeric_columns)
         
-        plt.figure(figsize=figsize)
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0,
-                   square=True, fmt='.3f')
-        plt.title('Correlation Matrix')
+        # Label only cells with |r| >= annotate_min, and none once the grid is too dense to read
+        if len(numeric_columns) <= 50:
+            for i, j in np.argwhere(np.abs(correlation_matrix) >= annotate_min):
+                value = correlation_matrix[i, j]
+                ax.text(j, i, f"{value:.3f}", ha='center', va='center',
+                        color='white' if abs(value) > 0.6 else 'black')
+        
+        ax.set_title('Correlation Matrix')
         plt.tight_layout()
         plt.savefig(output_file, dpi=300, bbox_inches='tight')
         plt.close()
@@ -315,6 +540,8 @@ class StatisticalAnalyzer:
                                    output_file: str = "group_comparison.png",
                                    figsize: Tuple[int, int] = (12, 8)):
         """Compare groups statistically and create visualization"""
+        import matplotlib.pyplot as plt
+        
         if group_column not in df.columns or value_column not in df.columns:
             self.logger.error("Group or value column not found in dataframe")
             return
@@ -322,8 +549,11 @@ class StatisticalAnalyzer:
         # Group the data
         groups = df.groupby(group_column)[value_column]
         
-        # Perform ANOVA
-        anova_result = self.perform_anova({name: group for name, group in groups})
+        # Perform ANOVA on sorted group codes (groupby's order), without per-group Series
+        codes, names = pd.factorize(df[group_column], sort=True)
+        values = df[value_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = (codes >= 0) & ~np.isnan(values)
+        anova_result = self._one_way_anova(codes[valid], values[valid], list(names))
         
         # Create comparison plot
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
@@ -4,10 +4,48 @@ Centralizes all configuration settings and paths
 """
 
 import os
+import copy
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
+from functools import lru_cache
+
+# libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+
+# Directory fields created on demand rather than on every Config()
+DIRECTORY_FIELDS = ('data_dir', 'results_dir', 'logs_dir', 'alphafold_output_dir', 'json_files_dir')
+
+# Directories already known to exist in this process
+_ensured_dirs = set()
+
+
+def _ensure_dir(dir_path: Path) -> Path:
+    """Create dir_path if missing, checking each path at most once per process"""
+    if dir_path not in _ensured_dirs:
+        if not dir_path.is_dir():
+            dir_path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(dir_path)
+    return dir_path
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(config_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML config file; cached per (path, modification time)"""
+    with open(config_path, 'r') as f:
+        config_data = yaml.load(f, Loader=_Loader)
+    
+    # Convert string paths to Path objects
+    for key, value in config_data.items():
+        if isinstance(value, str) and key.endswith('_dir'):
+            config_data[key] = Path(value)
+    
+    return config_data
 
 
 @dataclass
@@ -46,23 +84,24 @@ class Config:
     supported_formats: list = field(default_factory=lambda: ["csv", "json", "fasta", "xlsx"])
     
     def __post_init__(self):
+        """Create all directories up front only when ALPHAFOLD_CORE_INIT_DIRS=1"""
+        # Otherwise directories are created on first use by get_file_path, so
+        # importing the global config touches no files
+        if os.environ.get('ALPHAFOLD_CORE_INIT_DIRS') == '1':
+            self.ensure_directories()
+    
+    def ensure_directories(self):
         """Ensure all directories exist"""
-        for dir_path in [self.data_dir, self.results_dir, self.logs_dir, 
-                        self.alphafold_output_dir, self.json_files_dir]:
-            dir_path.mkdir(parents=True, exist_ok=True)
+        for name in DIRECTORY_FIELDS:
+            _ensure_dir(getattr(self, name))
     
     @classmethod
     def from_yaml(cls, config_path: str) -> 'Config':
         """Load configuration from YAML file"""
-        with open(config_path, 'r') as f:
-            config_data = yaml.safe_load(f)
-        
-        # Convert string paths to Path objects
-        for key, value in config_data.items():
-            if isinstance(value, str) and key.endswith('_dir'):
-                config_data[key] = Path(value)
-        
-        return cls(**config_data)
+        # Re-reads only when the file changes; each call still gets its own Config,
+        # built from a copy so callers cannot mutate the cached data
+        config_data = _load_yaml_cached(str(config_path), os.path.getmtime(config_path))
+        return cls(**copy.deepcopy(config_data))
     
     def to_yaml(self, config_path: str):
         """Save configuration to YAML file"""
@@ -74,7 +113,7 @@ class Config:
                 config_dict[key] = value
         
         with open(config_path, 'w') as f:
-            yaml.dump(config_dict, f, default_flow_style=False, indent=2)
+            yaml.dump(config_dict, f, Dumper=_Dumper, default_flow_style=False, indent=2)
     
     def get_file_path(self, file_type: str, filename: str) -> Path:
         """Get standardized file path based on type"""
@@ -87,7 +126,7 @@ class Config:
         }
         
         base_path = path_mapping.get(file_type, self.base_dir)
-        return base_path / filename
+        return _ensure_dir(base_path) / filename
 
 
 # Global configuration instance
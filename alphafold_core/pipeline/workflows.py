@@ -729,18 +729,22 @@ class AF3SummaryAnalysisWorkflow:
             'filtered_data': {}
         }
         
+        # Numeric columns are shared by the assessment, the report and the plots
+        numeric_columns = df.select_dtypes(include='number').columns
+        
         # Quality assessment
-        quality_assessment = self.quality_analyzer.assess_prediction_quality(df)
+        quality_assessment = self.quality_analyzer.assess_prediction_quality(df, numeric_columns=numeric_columns)
         results['quality_assessment'] = quality_assessment
         
         # Generate quality report
         quality_report_file = f"{output_prefix}_quality_report.txt"
-        quality_report = self.quality_analyzer.generate_quality_report(df, quality_report_file)
+        quality_report = self.quality_analyzer.generate_quality_report(df, quality_report_file,
+                                                                       numeric_columns=numeric_columns)
         results['output_files']['quality_report'] = quality_report_file
         
         # Create quality plots
         quality_plots_file = f"{output_prefix}_quality_distributions.png"
-        self.quality_analyzer.plot_quality_distributions(df, quality_plots_file)
+        self.quality_analyzer.plot_quality_distributions(df, quality_plots_file, numeric_columns=numeric_columns)
         results['output_files']['quality_plots'] = quality_plots_file
         
         # Filter high-quality predictions
@@ -770,27 +774,30 @@ class AF3SummaryAnalysisWorkflow:
             'hypothesis_tests': {}
         }
         
-        # Get numeric columns for analysis
-        numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
+        # Get numeric columns for analysis, materialized once and shared by every step
+        numeric_view = self.statistical_analyzer.numeric_view(df)
+        numeric_columns = numeric_view[0]
         
         # Descriptive statistics
-        stats_analysis = self.statistical_analyzer.analyze_dataframe_statistics(df, numeric_columns)
+        stats_analysis = self.statistical_analyzer.analyze_dataframe_statistics(df, numeric_columns,
+                                                                                numeric_view=numeric_view)
         results['statistical_summary'] = stats_analysis
         
         # Generate statistical report
         stats_report_file = f"{output_prefix}_statistical_report.txt"
-        stats_report = self.statistical_analyzer.create_statistical_report(df, stats_report_file)
+        stats_report = self.statistical_analyzer.create_statistical_report(df, stats_report_file,
+                                                                           numeric_view=numeric_view)
         results['output_files']['statistical_report'] = stats_report_file
         
         # Create statistical plots
         stats_plots_file = f"{output_prefix}_statistical_summary.png"
-        self.statistical_analyzer.plot_statistical_summary(df, stats_plots_file)
+        self.statistical_analyzer.plot_statistical_summary(df, stats_plots_file, numeric_view=numeric_view)
         results['output_files']['statistical_plots'] = stats_plots_file
         
         # Correlation analysis
         if len(numeric_columns) > 1:
             correlation_file = f"{output_prefix}_correlation_matrix.png"
-            self.statistical_analyzer.plot_correlation_matrix(df, correlation_file)
+            self.statistical_analyzer.plot_correlation_matrix(df, correlation_file, numeric_view=numeric_view)
             results['output_files']['correlation_matrix'] = correlation_file
         
         # Confidence intervals for key metrics
@@ -832,17 +839,17 @@ class AF3SummaryAnalysisWorkflow:
                 
                 # Generate comparison report
                 comparison_report_file = f"{output_prefix}_comparison_report.txt"
-                comparison_report = self.comparison_analyzer.create_comparison_report(
-                    comparison_results, comparison_report_file
+                self.comparison_analyzer.create_comparison_report(
+                    comparison_results, comparison_report_file, return_text=False
                 )
                 results['output_files']['comparison_report'] = comparison_report_file
                 
                 # Create comparison plots
                 comparison_plots_file = f"{output_prefix}_comparison_summary.png"
-                self.comparison_analyzer.plot_comparison_summary(
+                if self.comparison_analyzer.plot_comparison_summary(
                     comparison_results, comparison_plots_file
-                )
-                results['output_files']['comparison_plots'] = comparison_plots_file
+                ):
+                    results['output_files']['comparison_plots'] = comparison_plots_file
         
         return results
     
@@ -65,11 +65,32 @@ def safe_json_load(file_path: Union[str, Path]) -> Optional[Dict]:
         return None
 
 
+def _json_default(obj: Any) -> Any:
+    """Convert NumPy arrays and scalars for the stdlib JSON encoder"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def safe_json_save(data: Dict, file_path: Union[str, Path], indent: int = 2):
     """Safely save data to JSON file with error handling"""
     try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=indent)
+        try:
+            import orjson
+        except ImportError:
+            orjson = None
+        
+        # orjson writes NumPy arrays and scalars straight from their buffers; it
+        # only indents by 2, so other indents go through the stdlib encoder.
+        # Unlike the stdlib encoder, orjson writes NaN and +/-inf as null.
+        if orjson is not None and indent == 2:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, default=_json_default,
+                                     option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                                     | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(file_path, 'w') as f:
+                json.dump(data, f, indent=indent, default=_json_default)
         return True
     except Exception as e:
         logging.error(f"Error saving JSON file {file_path}: {e}")